@@ -0,0 +1,84 @@
+"""
+Times Circuit.run() on the circuits the scenes actually simulate.
+
+    python benchmarks/circuit_run.py
+"""
+
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import ti_timer  # noqa: E402
+from circuit import Circuit, Clock  # noqa: E402
+from ti_timer import AND, NOT, OR, CPUTimerCounter, Register  # noqa: E402
+
+REPEATS = 30
+
+
+def cpu_timer_scene():
+    """Sections A and C of ti-cpu-timer/main.py, without the visuals."""
+    c = Circuit()
+
+    clk = Clock("SYSCLK", period=2)
+    for comp in [clk, OR("Reset_OR"), OR("Pre_OR"), OR("Main_OR"), AND("Gate_AND"), NOT("INV"),
+                 Register("TDDR", 2), CPUTimerCounter("PSC", 2), Register("PRD", 5), CPUTimerCounter("TIM", 5)]:
+        c.add(comp)
+
+    c.connect("SYSCLK", "clk", "Gate_AND", "A")
+    c.connect("INV", "out", "Gate_AND", "B")
+    c.connect("Gate_AND", "out", "PSC", "clk")
+    c.connect("Reset_OR", "out", "Pre_OR", "A")
+    c.connect("Reset_OR", "out", "Main_OR", "A")
+    c.connect("PSC", "borrow", "Pre_OR", "B")
+    c.connect("Pre_OR", "out", "PSC", "load")
+    c.connect("PSC", "borrow", "TIM", "clk")
+    c.connect("TIM", "borrow", "Main_OR", "B")
+    c.connect("Main_OR", "out", "TIM", "load")
+    c.connect("TDDR", "out", "PSC", "din")
+    c.connect("PRD", "out", "TIM", "din")
+
+    c.poke("INV", "in", 0)
+    c.poke("Reset_OR", "A", 0)
+    c.poke("Reset_OR", "B", 0)
+
+    num_steps = 60
+    pokes = {
+        2: ("Reset_OR", "A", 0),
+        40: ("INV", "in", 1),
+        47: ("Reset_OR", "A", 1),
+        50: ("INV", "in", 0),
+        58: ("Reset_OR", "A", 0),
+    }
+
+    clk.prefill(c, num_steps)
+    c.poke("Reset_OR", "A", 1)
+
+    for step in range(num_steps):
+        c.run(steps=1)
+        if step in pokes:
+            c.poke(*pokes[step])
+
+
+def ti_timer_demo():
+    with contextlib.redirect_stdout(io.StringIO()):
+        ti_timer.demo()
+
+
+def best_of(fn, repeats=REPEATS):
+    fn()  # warm up
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    for name, fn in [("ti_timer.demo", ti_timer_demo), ("CPU timer scene", cpu_timer_scene)]:
+        print(f"{name:<16} {best_of(fn) * 1e3:6.2f} ms")
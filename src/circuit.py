@@ -1,23 +1,74 @@
-import heapq
+import operator
+from bisect import bisect_right
 from collections import defaultdict
+from collections.abc import Callable
+
+import numpy as np
 
 type Key = tuple[str, str]
 type Value = int | bool
 
 DELAY = 1
 
+# Counters drive multi-bit values (up to 0xFFFF), so a byte per pin is not enough
+SIGNAL_DTYPE = np.int32
+
+# Steps with at most this many active components skip the array phases of
+# run() and go through each component's own evaluate() / commit(). The demo
+# and scene circuits rarely wake more than a few components per step, where
+# the fixed cost of the gathers and full pin compare dominates
+SCALAR_MAX_ACTIVE = 32
+
+
+def _csr_gather(offset: np.ndarray, targets: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenation of targets[offset[r]:offset[r + 1]] for every r in rows."""
+    starts = offset[rows]
+    lengths = offset[rows + 1] - starts
+    # Position within each slice, shifted to where that slice starts in targets
+    idx = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return targets[idx + np.repeat(starts, lengths)]
+
 
 class Signal:
-    def __init__(self, value: Value = 0):
-        self.value = value
-        self.next_value = value
+    """View onto one pin slot of the circuit's ``values`` / ``next_values`` arrays."""
+
+    # Only the owner and slot, the value itself lives in the circuit's arrays.
+    # The circuit is kept rather than the arrays since alloc_pin() regrows them
+    __slots__ = ("circuit", "idx")
+
+    def __init__(self, circuit: "Circuit", idx: int):
+        self.circuit = circuit
+        self.idx = idx
+
+    @property
+    def value(self) -> Value:
+        c, idx = self.circuit, self.idx
+        value = c.values.item(idx)
+        return bool(value) if c.bool_pins[idx] else value
+
+    @value.setter
+    def value(self, value: Value):
+        c = self.circuit
+        c.values[self.idx] = value
+        c.bool_pins[self.idx] = value.__class__ is bool
+
+    @property
+    def next_value(self) -> Value:
+        c, idx = self.circuit, self.idx
+        value = c.next_values.item(idx)
+        return bool(value) if c.bool_pins[idx] else value
 
     def set_next(self, value: Value):
-        self.next_value = value
+        c = self.circuit
+        c.next_values[self.idx] = value
+        c.bool_pins[self.idx] = value.__class__ is bool
 
     def commit(self):
-        changed = self.value != self.next_value
-        self.value = self.next_value
+        c, idx = self.circuit, self.idx
+        new = c.next_values.item(idx)
+        values = c.values
+        changed = values.item(idx) != new
+        values[idx] = new
         return changed
 
     def __repr__(self):
@@ -25,20 +76,62 @@ class Signal:
 
 
 class Component:
-    def __init__(self, name: str, inputs: list[str], outputs: list[str]):
+    # Subclasses that declare their own __slots__ carry no per-instance dict
+    __slots__ = ("name", "inputs", "outputs", "state_pins", "initial", "circuit", "signals", "_signals", "_outputs", "_state")
+
+    # Kinds that set this are evaluated by the circuit with a single
+    # evaluate_batch() call per step covering all of their active instances
+    batched = False
+
+    def __init__(self, name: str, inputs: list[str], outputs: list[str], state_pins: list[str] = ()):
         self.name = name
         self.inputs = inputs
         self.outputs = outputs
+        # Internal pins, committed like outputs but never wake up dependents
+        self.state_pins = list(state_pins)
+
+        # Pin values to start from once the component is added to a circuit
+        self.initial: dict[str, Value] = {s: 0 for s in inputs + outputs + self.state_pins}
 
-        self.signals = {s: Signal() for s in inputs + outputs}
+        self.circuit = None
+        self.signals: dict[str, Signal] = {}
+        # Same signals in inputs + outputs + state order, for index based access
+        self._signals: tuple[Signal, ...] = ()
+        self._outputs: tuple[Signal, ...] = ()
+        self._state: tuple[Signal, ...] = ()
+
+    def bind(self, circuit: "Circuit"):
+        self.circuit = circuit
+        self.signals = {s: circuit.alloc_pin(v) for s, v in self.initial.items()}
+        self.update_ids()
+
+    def update_ids(self):
+        self._signals = tuple(self.signals[s] for s in self.inputs + self.outputs + self.state_pins)
+        self._outputs = tuple(self.signals[o] for o in self.outputs)
+        self._state = tuple(self.signals[s] for s in self.state_pins)
 
     def evaluate(self):
         raise NotImplementedError
 
+    @classmethod
+    def batch_params(cls, comps: list["Component"]) -> dict[str, np.ndarray]:
+        """Per instance constants needed by evaluate_batch(), one entry per component."""
+        return {}
+
+    @classmethod
+    def evaluate_batch(cls, circuit: "Circuit", pins: np.ndarray, params: dict[str, np.ndarray]):
+        """Evaluates many components of this kind, ``pins`` holds one row of pin ids per component."""
+        raise NotImplementedError
+
     def commit(self):
+        """Commits the outputs and state pins, True if any output changed."""
+        for s in self._state:
+            s.commit()
+
         changed = False
-        for o in self.outputs:
-            changed |= self.signals[o].commit()
+        for s in self._outputs:
+            # No short circuit, every output has to be committed
+            changed |= s.commit()
         return changed
 
     def next_events(self, t: int):
@@ -59,25 +152,155 @@ class Circuit:
         self.delay = delay
         self.components = {}
         self.deps = defaultdict(set)  # component → downstream components
-        self.events = []
+        # Events known ahead of time (pokes, clock starts), sorted by time and
+        # consumed through static_ptr
+        self.static_events: list[tuple[int, str]] = []
+        self.static_ptr = 0
+        # Events emitted while running, time → components to evaluate at that
+        # time. Sets dedupe repeated schedules for free. A fixed ring of
+        # delay + 1 slots is not enough since clocks schedule themselves
+        # period // 2 ahead.
+        self.buckets: dict[int, set[str]] = {}
         self.time = 0
-        self.scheduled = set()
+
+        # (component, pin) → pin id, connect() points the destination at the
+        # source's id and finalize() reads everything from here
+        self.pin_of: dict[Key, int] = {}
+
+        # SoA signal storage, indexed by pin id
+        self.num_pins = 0
+        self.values = np.zeros(16, dtype=SIGNAL_DTYPE)
+        self.next_values = np.zeros(16, dtype=SIGNAL_DTYPE)
+        # Whether the last value written to a pin through its Signal was a
+        # bool, so reads hand back the Python type that was written (the LED's
+        # state compares two pins). The arrays themselves only hold ints
+        self.bool_pins: list[bool] = []
+
+        # (batched kind, pin count) → (n, pins) array of pin ids, one row per
+        # component, plus the per component constants its kernel needs
+        self.kinds: dict[tuple[type, int], np.ndarray] = {}
+        self.kind_params: dict[tuple[type, int], dict[str, np.ndarray]] = {}
+        # Component name → (group, row in that group's table)
+        self.kind_rows: dict[str, tuple[tuple[type, int], int]] = {}
+
+        # CSR form of deps, the fan-out of component id i is
+        # deps_targets[deps_offset[i]:deps_offset[i + 1]]
+        self.comp_ids: dict[str, int] = {}
+        self.comp_names: list[str] = []
+        self.deps_offset = np.zeros(1, dtype=np.intp)
+        self.deps_targets = np.empty(0, dtype=np.intp)
+        # Same for the components driving each pin id, so a changed pin leads
+        # straight to the components whose outputs changed
+        self.owner_offset = np.zeros(1, dtype=np.intp)
+        self.owner_ids = np.empty(0, dtype=np.intp)
+
+        # Set whenever the topology changes, run() then calls finalize()
+        self.stale = False
+
+    def alloc_pin(self, value: Value = 0) -> Signal:
+        if self.num_pins == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+            self.next_values = np.concatenate([self.next_values, np.zeros_like(self.next_values)])
+
+        idx = self.num_pins
+        self.num_pins += 1
+
+        self.values[idx] = value
+        self.next_values[idx] = value
+        self.bool_pins.append(value.__class__ is bool)
+
+        return Signal(self, idx)
 
     def add(self, c: Component):
         self.components[c.name] = c
+        c.bind(self)
+        self.pin_of.update({(c.name, pin): sig.idx for pin, sig in c.signals.items()})
+        self.stale = True
+
+    def finalize(self):
+        """Freezes the topology into the flat arrays the run loop works on."""
+        self.comp_names = list(self.components)
+        self.comp_ids = {name: i for i, name in enumerate(self.comp_names)}
+
+        offsets = [0]
+        targets = []
+        for name in self.comp_names:
+            targets.extend(self.comp_ids[n] for n in self.deps[name])
+            offsets.append(len(targets))
+
+        self.deps_offset = np.array(offsets, dtype=np.intp)
+        self.deps_targets = np.array(targets, dtype=np.intp)
+
+        # Outputs can be aliased by connect(), so a pin may have several owners
+        pin_of = self.pin_of
+        owners = [[] for _ in range(len(self.values))]
+        for i, name in enumerate(self.comp_names):
+            for out in self.components[name].outputs:
+                owners[pin_of[name, out]].append(i)
+
+        self.owner_offset = np.cumsum([0] + [len(o) for o in owners], dtype=np.intp)
+        self.owner_ids = np.array([i for o in owners for i in o], dtype=np.intp)
+
+        # Grouped by kind and pin count, so kinds with a variable number of
+        # pins (Mux) still get rectangular pin tables
+        groups = defaultdict(list)
+        self.kind_rows = {}
+
+        for name, comp in self.components.items():
+            if comp.batched:
+                group = (type(comp), len(comp._signals))
+                members = groups[group]
+                self.kind_rows[name] = (group, len(members))
+                members.append(comp)
+
+        self.kinds = {
+            group: np.array(
+                [[pin_of[c.name, p] for p in c.inputs + c.outputs + c.state_pins] for c in members], dtype=np.intp
+            )
+            for group, members in groups.items()
+        }
+        self.kind_params = {group: group[0].batch_params(members) for group, members in groups.items()}
+        self.stale = False
 
     def schedule(self, comp: str, t: int):
-        if (comp, t) not in self.scheduled:
-            heapq.heappush(self.events, (t, comp))
-            self.scheduled.add((comp, t))
+        events = self.static_events
+
+        if self.static_ptr == len(events):
+            events.clear()
+            self.static_ptr = 0
+
+        # Equal times keep insertion order, never insert before the read pointer.
+        # Duplicate entries are allowed, run() collapses them into the active set
+        i = bisect_right(events, t, lo=self.static_ptr, key=lambda e: e[0])
+        events.insert(i, (t, comp))
+
+    def schedule_many(self, comp: str, times):
+        """Bulk schedule(), a single stable sort instead of one insert per event."""
+        pending = self.static_events[self.static_ptr:]
+        pending.extend((t, comp) for t in times)
+        pending.sort(key=lambda e: e[0])
+
+        # In place, run() holds on to the list
+        self.static_events[:] = pending
+        self.static_ptr = 0
+
+    def emit(self, comp: str, t: int):
+        bucket = self.buckets.get(t)
+        if bucket is None:
+            self.buckets[t] = {comp}
+        else:
+            bucket.add(comp)
 
     def connect(self, src_comp: str, src_pin: str, dst_comp: str, dst_pin: str):
-
-        src = self.components[src_comp]
         dst = self.components[dst_comp]
 
-        dst.signals[dst_pin] = src.signals[src_pin]
+        # Remaps the pin id, both components now read and write the same slot
+        idx = self.pin_of[dst_comp, dst_pin] = self.pin_of[src_comp, src_pin]
+        # Keeps the component's own views in line for its scalar evaluate()
+        dst.signals[dst_pin] = Signal(self, idx)
+        dst.update_ids()
         self.deps[src_comp].add(dst_comp)
+        self.stale = True
 
     def poke(self, comp: str, signal: str, value: Value):
         c = self.components[comp]
@@ -85,40 +308,95 @@ class Circuit:
         c[signal].commit()
         self.schedule(comp, self.time)
 
+    def _step_scalar(self, t: int, active: set[str]) -> bool:
+        """Same three phases as run(), one component at a time."""
+        comps = [self.components[name] for name in active]
+
+        for comp in comps:
+            comp.evaluate()
+            for (nt, target) in comp.next_events(t):
+                self.emit(target, nt)
+
+        woken = set()
+        for comp in comps:
+            if comp.commit():
+                woken.update(self.deps[comp.name])
+
+        if woken:
+            self.buckets.setdefault(t + self.delay, set()).update(woken)
+        return bool(woken)
+
     def run(self, steps: int = 100) -> bool:
         updated_data = False
 
-        while self.events and steps > 0:
-            t, _ = self.events[0]
+        if self.stale:
+            self.finalize()
+
+        static = self.static_events
+
+        while (self.buckets or self.static_ptr < len(static)) and steps > 0:
+            # Only a handful of distinct times are ever pending at once
+            t = min(self.buckets, default=None)
+            if self.static_ptr < len(static) and (t is None or static[self.static_ptr][0] < t):
+                t = static[self.static_ptr][0]
             self.time = t
 
-            active = set()
-            while self.events and self.events[0][0] == t:
-                _, c = heapq.heappop(self.events)
-                self.scheduled.discard((c, t))
-                active.add(c)
+            active = self.buckets.pop(t, set())
+            while self.static_ptr < len(static) and static[self.static_ptr][0] == t:
+                active.add(static[self.static_ptr][1])
+                self.static_ptr += 1
+
+            if len(active) <= SCALAR_MAX_ACTIVE:
+                updated_data |= self._step_scalar(t, active)
+                steps -= 1
+                continue
 
             # Phase 1: evaluate
+            # Batched kinds are gathered and evaluated with one kernel call each.
+            # The same single pass over active also notes the component ids for
+            # phase 3 and queues the autonomous events, which only depend on t
+            batches = defaultdict(list)
+            is_active = np.zeros(len(self.comp_names), dtype=bool)
             for name in active:
-                self.components[name].evaluate()
+                comp = self.components[name]
+                is_active[self.comp_ids[name]] = True
+
+                if comp.batched:
+                    group, row = self.kind_rows[name]
+                    batches[group].append(row)
+                else:
+                    comp.evaluate()
+
+                for (nt, target) in comp.next_events(t):
+                    self.emit(target, nt)
+
+            for group, rows in batches.items():
+                params = {k: v[rows] for k, v in self.kind_params[group].items()}
+                group[0].evaluate_batch(self, self.kinds[group][rows], params)
 
             # Phase 2: commit
-            changed = set()
-            for name in active:
-                if self.components[name].commit():
-                    changed.add(name)
+            # Only the active components wrote to next_values, so a single
+            # vector compare/copy commits every one of them at once. The arrays
+            # grow by doubling, the unallocated tail never changes
+            n = self.num_pins
+            values, next_values = self.values[:n], self.next_values[:n]
+            changed_mask = values != next_values
+            np.copyto(values, next_values)
 
             # Phase 3: schedule dependents
-            for c in changed:
-                for n in self.deps[c]:
-                    updated_data = True
-                    self.schedule(n, t + self.delay)
+            # Work is proportional to the dirty pins: they map to the active
+            # components that drive them, and those to their fan-out
+            dirty = np.flatnonzero(changed_mask)
 
-            # Phase 4: Autonomous components
-            for name in active:
-                comp = self.components[name]
-                for (nt, target) in comp.next_events(t):
-                    self.schedule(target, nt)
+            if len(dirty):
+                owners = _csr_gather(self.owner_offset, self.owner_ids, dirty)
+                owners = np.unique(owners[is_active[owners]])
+                targets = _csr_gather(self.deps_offset, self.deps_targets, owners)
+
+                if len(targets):
+                    updated_data = True
+                    names = self.comp_names
+                    self.buckets.setdefault(t + self.delay, set()).update(map(names.__getitem__, targets.tolist()))
 
             steps -= 1
 
@@ -133,53 +411,131 @@ class Circuit:
         return "\n".join(components)
 
 
-class AND(Component):
-    def __init__(self, name: str):
-        super().__init__(name, ["A", "B"], ["out"])
+class VectorGate(Component):
+    """
+    Two input gate the circuit evaluates in bulk, every active gate of the same
+    kind at once, by applying ``op`` to the ``values`` array.
+    """
 
-    def evaluate(self):
-        self["out"].set_next(self["A"].value and self["B"].value)
+    __slots__ = ()
+
+    batched = True
 
+    A_IDX, B_IDX, OUT_IDX = 0, 1, 2
+
+    op: np.ufunc
+    # Same operation on the two inputs' truth values, for the scalar path.
+    # A ufunc call on python ints costs more than the rest of evaluate()
+    scalar_op: Callable[[bool, bool], bool]
 
-class OR(Component):
     def __init__(self, name: str):
         super().__init__(name, ["A", "B"], ["out"])
 
     def evaluate(self):
-        self["out"].set_next(self["A"].value or self["B"].value)
+        s = self._signals
+        s[self.OUT_IDX].set_next(int(self.scalar_op(s[self.A_IDX].value != 0, s[self.B_IDX].value != 0)))
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        values = circuit.values
+        circuit.next_values[pins[:, cls.OUT_IDX]] = cls.op(values[pins[:, cls.A_IDX]], values[pins[:, cls.B_IDX]])
+
+
+class AND(VectorGate):
+    __slots__ = ()
+
+    op = np.logical_and
+    scalar_op = operator.and_
+
+
+class OR(VectorGate):
+    __slots__ = ()
+
+    op = np.logical_or
+    scalar_op = operator.or_
 
 
 class DownCounter(Component):
+    """The count lives on the ``out`` pin and the previous clock on a state pin."""
+
+    __slots__ = ("bits",)
+
+    batched = True
+
+    CLK_IDX, LOAD_IDX, DIN_IDX, OUT_IDX, PREV_CLK_IDX = 0, 1, 2, 3, 4
+
     def __init__(self, name: str, bits: int = 4):
-        super().__init__(name, ["clk", "load", "din"], ["out"])
+        super().__init__(name, ["clk", "load", "din"], ["out"], state_pins=["prev_clk"])
         self.bits = bits
-        self.state = 0
-        self.prev_clk = 0
 
     def evaluate(self):
-        clk = self["clk"].value
+        s = self._signals
+        clk = s[self.CLK_IDX].value
+        count = s[self.OUT_IDX].value
 
         # rising edge
-        if self.prev_clk == 0 and clk == 1:
-            if self["load"].value:
-                self.state = self["din"].value
+        if s[self.PREV_CLK_IDX].value == 0 and clk == 1:
+            if s[self.LOAD_IDX].value:
+                count = s[self.DIN_IDX].value
             else:
-                self.state = (self.state - 1) % (1 << self.bits)
+                count = (count - 1) % (1 << self.bits)
+
+        s[self.PREV_CLK_IDX].set_next(clk)
+        s[self.OUT_IDX].set_next(count)
+
+    @classmethod
+    def batch_params(cls, comps):
+        return {"mask": np.array([(1 << c.bits) - 1 for c in comps], dtype=SIGNAL_DTYPE)}
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        values = circuit.values
 
-        self.prev_clk = clk
-        self["out"].set_next(self.state)
+        clk = values[pins[:, cls.CLK_IDX]]
+        count = values[pins[:, cls.OUT_IDX]]
+
+        rising = (values[pins[:, cls.PREV_CLK_IDX]] == 0) & (clk == 1)
+        # (count - 1) & mask is the modulo 2 ** bits wrap, -1 & mask == mask
+        reloaded = np.where(values[pins[:, cls.LOAD_IDX]] != 0, values[pins[:, cls.DIN_IDX]], (count - 1) & params["mask"])
+
+        circuit.next_values[pins[:, cls.PREV_CLK_IDX]] = clk
+        circuit.next_values[pins[:, cls.OUT_IDX]] = np.where(rising, reloaded, count)
 
 
 class Clock(Component):
+    __slots__ = ("period", "half_period", "horizon")
+
+    batched = True
+
+    CLK_IDX = 0
+
     def __init__(self, name: str, period: int = 2):
         super().__init__(name, [], ["clk"])
-        self.period = period
+        self.period = int(period)
+        # Time between two edges, fixed for the clock's lifetime
+        self.half_period = self.period // 2
+        # Ticks before this time were scheduled up front by prefill()
+        self.horizon = 0
 
     def evaluate(self):
-        self["clk"].set_next(1 - self["clk"].value)
+        clk = self._signals[self.CLK_IDX]
+        clk.set_next(1 - clk.value)
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        clk = pins[:, cls.CLK_IDX]
+        circuit.next_values[clk] = 1 - circuit.values[clk]
+
+    def prefill(self, circuit: Circuit, horizon: int, start: int = 0):
+        """Schedules every tick in [start, horizon) at once instead of one per tick."""
+        circuit.schedule_many(self.name, range(start, horizon, self.half_period))
+        self.horizon = max(self.horizon, horizon)
 
     def next_events(self, t):
-        return [(t + self.period // 2, self.name)]
+        nt = t + self.half_period
+        if nt < self.horizon:
+            return []
+        return [(nt, self.name)]
 
 
 def demo1():
@@ -99,7 +99,7 @@ class GPIOLED(Scene):
 
         all_.append(t_led)
 
-        self.play(*map(Create, all_), run_tim=5)
+        self.play(*map(Create, all_), run_time=5)
         self.add(*all_)
 
         self.wait(1)
@@ -116,22 +116,43 @@ class GPIOLED(Scene):
         # 1 step to set the LED
         c.run(steps=2)
 
+        # The watched signals never change identity, so resolve them once
+        watched = [
+            (c.components[comp_name].signals[sig_name], visual_wire)
+            for (comp_name, sig_name), visual_wire in signal_map.items()
+        ]
+        # The .animate builders share each mobject's target so they cannot be
+        # cached, instead only the visuals whose signal toggled get rebuilt
+        shown: dict[int, bool] = {}
+
+        # Every step is simulated first and rendered afterwards in a single play
+        steps = []
+
         for step in range(20):
             c.run(steps=1)
 
             # Update Wires
-            for (comp_name, sig_name), visual_wire in signal_map.items():
+            for i, (signal, visual_wire) in enumerate(watched):
                 visual_wire: VisualGroup
 
-                val = c.components[comp_name].signals[sig_name].value
-                animations.extend(visual_wire.set_active(True if val else False))
+                val = bool(signal.value)
+                if shown.get(i) != val:
+                    shown[i] = val
+                    animations.extend(visual_wire.set_active(val))
 
-            if get_animate() and animations:
-                self.play(*animations)
+            if get_animate():
+                # Grouped right away so the builders are turned into animations
+                # before the next set_active() regenerates their mobject's target.
+                # An idle step keeps the pacing of a one second play
+                step_animation = AnimationGroup(*animations) if animations else Wait(1)
+                steps.append(Succession(step_animation, Wait(3)))
+            else:
+                self.wait(3)
 
             animations.clear()
 
-            self.wait(3)
+        if steps:
+            self.play(Succession(*steps))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,20 @@
 from manim import *
 
 
+def _build_points(duty_cycle, periods=4):
+    # Corners of a single period: high pulse, then the low stretch
+    offsets = [[0, 0], [0, 1], [duty_cycle, 1], [duty_cycle, 0]]
+    if duty_cycle < 1:
+        offsets += [[duty_cycle, 0], [1, 0]]
+
+    # Repeat for every period by shifting along x, (periods * len(offsets), 2)
+    return (np.arange(periods)[:, None, None] * [1, 0] + np.array(offsets)).reshape(-1, 2)
+
+
+# Axes coordinates of every duty cycle the scene shows, only c2p is left per build
+_PWM_POINTS = {d: _build_points(d) for d in (0.25, 0.5, 0.75)}
+
+
 class PWMAnimation(Scene):
     def construct(self):
         # Title
@@ -34,53 +48,58 @@ class PWMAnimation(Scene):
 
         # Function to create PWM signal
         def create_pwm_signal(duty_cycle, periods=4):
-            points = []
-            for i in range(periods):
-                # High period
-                points.extend([
-                    axes.c2p(i, 0),
-                    axes.c2p(i, 1),
-                    axes.c2p(i + duty_cycle, 1),
-                    axes.c2p(i + duty_cycle, 0),
-                ])
-                # Low period
-                if duty_cycle < 1:
-                    points.extend([
-                        axes.c2p(i + duty_cycle, 0),
-                        axes.c2p(i + 1, 0),
-                    ])
+            if periods == 4 and duty_cycle in _PWM_POINTS:
+                coords = _PWM_POINTS[duty_cycle]
+            else:
+                coords = _build_points(duty_cycle, periods)
+
+            # One batched coordinate transform instead of one c2p call per corner
+            points = axes.c2p(coords)
             return VMobject().set_points_as_corners(points).set_color(YELLOW)
 
+        # Build every signal shown in the scene once, the transitions below
+        # transform between these instead of rebuilding them inline
+        pwm_signals = {d: create_pwm_signal(d) for d in (0.5, 0.25, 0.75)}
+        # Same for the labels, the text is shaped once per duty cycle
+        duty_texts = {
+            d: Text(f"Duty Cycle: {int(d * 100)}%", font_size=32).next_to(axes, UP, buff=0.5)
+            for d in pwm_signals
+        }
+
         # Start with 50% duty cycle
         duty_cycle = 0.5
-        pwm_signal = create_pwm_signal(duty_cycle)
-        duty_text = Text(f"Duty Cycle: {int(duty_cycle * 100)}%", font_size=32)
-        duty_text.next_to(axes, UP, buff=0.5)
+        pwm_signal = pwm_signals[duty_cycle]
+        duty_text = duty_texts[duty_cycle]
 
         self.play(Create(pwm_signal), Write(duty_text))
 
-        # Create tracking dot
-        dot = Dot(color=GREEN, radius=0.08).move_to(axes.c2p(0, 0))
+        # Create tracking dot, every signal starts at the same axes origin
+        origin = axes.c2p(0, 0)
+        dot = Dot(color=GREEN, radius=0.08).move_to(origin)
         self.play(FadeIn(dot))
 
         # Animate the dot following the signal with LED response
-        def update_led(mob, alpha):
-            x_pos = alpha * 4
-            # Determine if signal is high or low
-            cycle_pos = x_pos % 1
-            is_high = cycle_pos < duty_cycle
-
-            if is_high:
-                mob.set_fill(opacity=0.8)
-                mob.set_color(YELLOW)
-            else:
-                mob.set_fill(opacity=0.1)
-                mob.set_color(RED)
+        def make_led_updater(duty, on_opacity, off_opacity=0.1, periods=4, run_time=4):
+            # The LED state is sampled once per rendered frame up front, the
+            # updater itself only indexes the schedule
+            n_frames = max(int(run_time * config.frame_rate), 1)
+            is_high = (np.linspace(0, 1, n_frames + 1) * periods) % 1 < duty
+
+            opacities = np.where(is_high, on_opacity, off_opacity).tolist()
+            colors = [YELLOW if high else RED for high in is_high]
+
+            def update_led(mob, alpha):
+                frame = round(alpha * n_frames)
+
+                mob.set_fill(opacity=opacities[frame])
+                mob.set_color(colors[frame])
+
+            return update_led
 
         # First animation: 50% duty cycle
         self.play(
             MoveAlongPath(dot, pwm_signal, rate_func=linear),
-            UpdateFromAlphaFunc(led_circle, update_led),
+            UpdateFromAlphaFunc(led_circle, make_led_updater(duty_cycle, 0.8)),
             run_time=4,
             rate_func=linear
         )
@@ -88,9 +107,8 @@ class PWMAnimation(Scene):
 
         # Transition to 25% duty cycle
         duty_cycle = 0.25
-        new_pwm_signal = create_pwm_signal(duty_cycle)
-        new_duty_text = Text(f"Duty Cycle: {int(duty_cycle * 100)}%", font_size=32)
-        new_duty_text.next_to(axes, UP, buff=0.5)
+        new_pwm_signal = pwm_signals[duty_cycle]
+        new_duty_text = duty_texts[duty_cycle]
 
         brightness_label = Text("Brightness: Lower", font_size=24, color=ORANGE)
         brightness_label.next_to(led_label, DOWN)
@@ -99,24 +117,12 @@ class PWMAnimation(Scene):
             Transform(pwm_signal, new_pwm_signal),
             Transform(duty_text, new_duty_text),
             Write(brightness_label),
-            dot.animate.move_to(axes.c2p(0, 0))
+            dot.animate.move_to(origin)
         )
 
-        def update_led_25(mob, alpha):
-            x_pos = alpha * 4
-            cycle_pos = x_pos % 1
-            is_high = cycle_pos < duty_cycle
-
-            if is_high:
-                mob.set_fill(opacity=0.4)
-                mob.set_color(YELLOW)
-            else:
-                mob.set_fill(opacity=0.1)
-                mob.set_color(RED)
-
         self.play(
             MoveAlongPath(dot, new_pwm_signal, rate_func=linear),
-            UpdateFromAlphaFunc(led_circle, update_led_25),
+            UpdateFromAlphaFunc(led_circle, make_led_updater(duty_cycle, 0.4)),
             run_time=4,
             rate_func=linear
         )
@@ -124,9 +130,8 @@ class PWMAnimation(Scene):
 
         # Transition to 75% duty cycle
         duty_cycle = 0.75
-        new_pwm_signal_75 = create_pwm_signal(duty_cycle)
-        new_duty_text_75 = Text(f"Duty Cycle: {int(duty_cycle * 100)}%", font_size=32)
-        new_duty_text_75.next_to(axes, UP, buff=0.5)
+        new_pwm_signal_75 = pwm_signals[duty_cycle]
+        new_duty_text_75 = duty_texts[duty_cycle]
 
         new_brightness_label = Text("Brightness: Higher", font_size=24, color=ORANGE)
         new_brightness_label.next_to(led_label, DOWN)
@@ -135,24 +140,12 @@ class PWMAnimation(Scene):
             Transform(pwm_signal, new_pwm_signal_75),
             Transform(duty_text, new_duty_text_75),
             Transform(brightness_label, new_brightness_label),
-            dot.animate.move_to(axes.c2p(0, 0))
+            dot.animate.move_to(origin)
         )
 
-        def update_led_75(mob, alpha):
-            x_pos = alpha * 4
-            cycle_pos = x_pos % 1
-            is_high = cycle_pos < duty_cycle
-
-            if is_high:
-                mob.set_fill(opacity=0.95)
-                mob.set_color(YELLOW)
-            else:
-                mob.set_fill(opacity=0.1)
-                mob.set_color(RED)
-
         self.play(
             MoveAlongPath(dot, new_pwm_signal_75, rate_func=linear),
-            UpdateFromAlphaFunc(led_circle, update_led_75),
+            UpdateFromAlphaFunc(led_circle, make_led_updater(duty_cycle, 0.95)),
             run_time=4,
             rate_func=linear
         )
@@ -1,12 +1,15 @@
-import heapq
+from heapq import heappop, heappush
 import math
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple, Set
+from functools import lru_cache
+from itertools import repeat
+from typing import List, NamedTuple, Tuple, Set
 
 import matplotlib.patches as patches
+from matplotlib.collections import LineCollection
 import matplotlib.pyplot as plt
-import networkx as nx
 import numpy as np
 
 # --- Configuration ---
@@ -14,26 +17,210 @@ GRID_SCALE = 0.1  # Resolution of the routing grid
 BEND_PENALTY = 50  # Cost added for making a 90-degree turn
 BASE_COST = 1  # Cost to move 1 unit
 MAX_ITERATIONS = 4  # Max rip-up and reroute attempts
+COARSE_TILE = 4  # Cells per side of a tile in the coarse global routing pass
+# Connections at least this long are routed coarse to fine, None disables it.
+# Faster on large boards, but the fine search is confined to the corridor and
+# can return a costlier route than the full search. Off by default
+COARSE_MIN_DISTANCE = None
+# A corridor route costing more than this times its lower bound is thrown
+# away and the connection searched over the whole grid instead
+COARSE_MAX_DETOUR = 1.5
+# Weighted A* factor of the first iteration, relaxed to 1 by the last. Around
+# 1.2 expands far fewer states on large grids, 1 keeps every full search
+# optimal
+HEURISTIC_WEIGHT = 1.0
+# Open list entries kept before the worst f_scores are dropped, bounds memory
+# on congested searches. Far above what a 50x50 search queues
+QUEUE_CAP = 50000
 
 MARGIN = 2
 
+# Use a cost high enough that going around is ALWAYS cheaper,
+# but low enough that we can 'escape' a pin if it starts inside.
+OBSTACLE_COST = 100000
+# Cost per wire already using a cell, wires negotiate with each other
+WIRE_COST = 100
+
+# Direction index → (dx, dy). Sorted the way the (dx, dy) tuples compare so
+# packed states break heap ties exactly like the original (Point, Point) entries
+DIRECTIONS = ((-1, 0), (0, -1), (0, 0), (0, 1), (1, 0))
+NO_DIRECTION = 2
+# Neighbor expansion order
+MOVES = (4, 0, 3, 1)
+
+
+@lru_cache(maxsize=8)
+def _neighbor_table(width: int, height: int):
+    """Per cell (neighbor cell, direction) pairs in MOVES order, bounds already checked."""
+    table = []
+    for x in range(width):
+        for y in range(height):
+            cell_neighbors = []
+            for d in MOVES:
+                next_x, next_y = x + DIRECTIONS[d][0], y + DIRECTIONS[d][1]
+                if 0 <= next_x < width and 0 <= next_y < height:
+                    cell_neighbors.append((next_x * height + next_y, d))
+            table.append(tuple(cell_neighbors))
+    return table
+
+
+def _manhattan_field(mask: np.ndarray) -> np.ndarray:
+    """L1 distance from every cell to the nearest True cell of mask."""
+    # Any real distance is below mask.size, so it doubles as infinity
+    field = np.where(mask, 0, mask.size)
+
+    # The L1 transform is separable, a forward and backward sweep per axis
+    for axis in range(field.ndim):
+        lines = np.moveaxis(field, axis, 0)
+        for i in range(1, len(lines)):
+            np.minimum(lines[i], lines[i - 1] + 1, out=lines[i])
+        for i in range(len(lines) - 2, -1, -1):
+            np.minimum(lines[i], lines[i + 1] + 1, out=lines[i])
+
+    return field
+
+
+def _astar_core(cell_cost, target_mask, heuristic, start, width, height, h_weight=1.0, queue_cap=QUEUE_CAP,
+                start_dir=NO_DIRECTION):
+    """
+    Multi target A* over flat integer states, no Point objects in the loop.
+
+    cell_cost, target_mask and heuristic (distance to the nearest target) are
+    flat per cell lists indexed by x * height + y, a state is
+    cell * len(DIRECTIONS) + direction index.
+    h_weight > 1 runs weighted A*, the path costs at most h_weight times the
+    optimum but far fewer states are expanded.
+    Once more than queue_cap entries are queued the highest f_scores are
+    dropped down to half of it, None disables the cap.
+    start_dir is the direction the path arrives at start with, bends away
+    from it are penalized like any other.
+    Returns the path as a list of (x, y) or None if no target is reachable.
+    """
+    n_dirs = len(DIRECTIONS)
+    sx, sy = start
+
+    # The loop only does table lookups: unrolled neighbors, the base plus bend
+    # cost per (last, new) direction and the congestion cost of entering a
+    # cell, with targets exempt so wires can dock into pins
+    neighbors = _neighbor_table(width, height)
+    step_costs = [
+        [BASE_COST + (BEND_PENALTY if last != NO_DIRECTION and new != last else 0) for new in range(n_dirs)]
+        for last in range(n_dirs)
+    ]
+    entry_costs = [0 if target else cost for cost, target in zip(cell_cost, target_mask)]
+    # Ordering uses the weighted heuristic, pruning the plain admissible one
+    weighted = heuristic if h_weight == 1 else [h * h_weight for h in heuristic]
+    start_state = (sx * height + sy) * n_dirs + start_dir
+
+    # Bucket queue: a bucket per distinct f_score, each a small heap of
+    # (g_score, state), plus a heap of the f_scores that have a bucket.
+    # Manhattan distances make many states share an f_score, so most pushes
+    # are an append to a short heap, and the order is the same as a single
+    # (f_score, g_score, state) heap
+    buckets = {0: [(0, start_state)]}
+    f_order = [0]
+    queued = 1
+    if queue_cap is None:
+        queue_cap = math.inf
+
+    # Dense per state tables, the state space is only width * height * 5.
+    # Plain lists since scalar reads are faster than on an ndarray
+    n_states = width * height * n_dirs
+    came_from = [-1] * n_states
+    g_scores = [float('inf')] * n_states
+    g_scores[start_state] = 0
+    # Every step costs at least BASE_COST and the Manhattan heuristic changes
+    # by at most 1 per step, so it is consistent: the first pop of a state is
+    # final and any later heap entry for it is stale. With a weight the first
+    # pop is only within h_weight of optimal, states are still not reopened
+    closed = [False] * n_states
+
+    best_end_state = None
+    min_g_to_target = float('inf')
+
+    while f_order:
+        f = f_order[0]
+        bucket = buckets[f]
+        g, state = heappop(bucket)
+        queued -= 1
+        if not bucket:
+            del buckets[f]
+            heappop(f_order)
+
+        if closed[state] or g >= min_g_to_target:
+            continue
+        closed[state] = True
+
+        cell, last_dir = divmod(state, n_dirs)
+
+        if target_mask[cell]:
+            if g < min_g_to_target:
+                min_g_to_target = g
+                best_end_state = state
+            continue
+
+        step_cost = step_costs[last_dir]
+
+        for neighbor, new_dir in neighbors[cell]:
+            # 1. Base Cost + 2. Congestion Cost
+            new_g = g + step_cost[new_dir] + entry_costs[neighbor]
+            new_state = neighbor * n_dirs + new_dir
+
+            if not closed[new_state] and new_g < g_scores[new_state]:
+                # Never pushed if it cannot beat the best target reached so far
+                if new_g + heuristic[neighbor] >= min_g_to_target:
+                    continue
+                g_scores[new_state] = new_g
+                new_f = new_g + weighted[neighbor]
+                bucket = buckets.get(new_f)
+                if bucket is None:
+                    buckets[new_f] = [(new_g, new_state)]
+                    heappush(f_order, new_f)
+                else:
+                    heappush(bucket, (new_g, new_state))
+                came_from[new_state] = state
+                queued += 1
+
+        if queued > queue_cap:
+            # Drop whole buckets from the worst end, a sorted list is still a
+            # heap. Dropped states keep their g_score, so this trades
+            # completeness for memory: a capped search can miss a route
+            f_order.sort()
+            while queued > queue_cap // 2 and len(f_order) > 1:
+                queued -= len(buckets.pop(f_order.pop()))
+
+    if best_end_state is None:
+        return None
+
+    start_cell = start_state // n_dirs
+
+    path = []
+    state = best_end_state
+    while state // n_dirs != start_cell:
+        path.append(divmod(state // n_dirs, height))
+        if came_from[state] < 0: break
+        state = came_from[state]
+    path.append(start)
+    return path[::-1]
 
-@dataclass(frozen=True)
-class Point:
+
+def _manhattan_to_nearest(points: np.ndarray, pixels: List["Point"]) -> np.ndarray:
+    """L1 distance from each of the (n, 2) points to the closest of the pixels."""
+    if not pixels:
+        return np.full(len(points), np.inf)
+    return np.abs(points[:, None, :] - np.array(pixels)[None, :, :]).sum(axis=2).min(axis=1)
+
+
+class Point(NamedTuple):
+    # A tuple so hashing, equality and (x, y) ordering run in C
     x: int
     y: int
 
     def __add__(self, other):
-        return Point(self.x + other.x, self.y + other.y)
+        return Point(self.x + other[0], self.y + other[1])
 
     def __sub__(self, other):
-        return Point(self.x - other.x, self.y - other.y)
-
-    def __le__(self, other):
-        return (self.x, self.y) <= (other.x, other.y)
-
-    def __gt__(self, other):
-        return (self.x, self.y) > (other.x, other.y)
+        return Point(self.x - other[0], self.y - other[1])
 
 
 @dataclass
@@ -58,76 +245,115 @@ class Component:
         return Component(self.name, self.x - margin, self.y - margin, self.width + margin * 2, self.height + margin * 2)
 
 
+# A pool worker's copy of the router, the occupancy snapshot of one iteration
+_worker_router: "Router | None" = None
+
+
+def _init_route_worker(router: "Router"):
+    global _worker_router
+    _worker_router = router
+
+
+def _route_net_snapshot(net_id: int, congestion_multiplier: float, h_weight: float) -> List[Point]:
+    """Process pool task, routes one net on the worker's own copy of the router."""
+    router = _worker_router
+    router._rip_up(net_id)
+    try:
+        return router._route_net(router.nets[net_id], congestion_multiplier, h_weight)
+    finally:
+        # Back to the snapshot for the next net this worker routes
+        if net_id in router.routed_coords:
+            router._add_wire(router.routed_coords[net_id], 1)
+
+
 class Router:
     def __init__(self, width, height):
         self.width = width
         self.height = height
-        # grid_occupancy tracks how many nets use a specific cell (x, y)
-        self.grid_occupancy = np.zeros((width, height), dtype=int)
+        # obstacle counts the (margin expanded) components covering a cell,
+        # wire_count how many nets use it. Kept apart so neither needs decoding
+        # Small counts, the narrow types keep the full grid passes cheap.
+        # wire_count is signed for the rip-up of a net and int16 so heavy
+        # congestion cannot wrap a cell negative, which would read as free
+        self.obstacle = np.zeros((width, height), dtype=np.uint8)
+        self.wire_count = np.zeros((width, height), dtype=np.int16)
+        # Index of the first component whose margin covers a cell, -1 if none.
+        # A grid bucket index so _pin_escape does not scan every component,
+        # int16 allows up to 32767 components
+        self.margin_owner = np.full((width, height), -1, dtype=np.int16)
         # history_cost tracks historically congested cells to discourage repeated use
-        self.history_cost = np.zeros((width, height), dtype=float)
+        self.history_cost = np.zeros((width, height), dtype=np.float32)
         self.components = []
+        # int_bbox of each component grown by MARGIN, computed once when added
+        self.margin_bboxes = []
         self.nets = []  # List of list of Points
         self.routed_paths = {}  # Map net_id -> List of Points
+        self.routed_coords = {}  # Map net_id -> (N, 2) int array of the same path
 
     def _pin_escape(self, pin: Point):
         """
         If pin is inside a component margin, return (escape_path, escape_point).
         Otherwise, return ([], pin).
         """
-        for comp in self.components:
-            comp_expanded = comp + MARGIN
-            xmin, ymin, xmax, ymax = comp_expanded.int_bbox
-
-            if xmin <= pin.x < xmax and ymin <= pin.y < ymax:
-                # Determine nearest face
-                dists = {
-                    Point(-1, 0): abs(pin.x - xmin),
-                    Point(1, 0): abs(xmax - pin.x),
-                    Point(0, -1): abs(pin.y - ymin),
-                    Point(0, 1): abs(ymax - pin.y),
-                }
-                direction = min(dists, key=dists.get)
-
-                path = [pin]
-                p = pin
-                while True:
-                    p = p + direction
-                    path.append(p)
-                    if not (xmin <= p.x < xmax and ymin <= p.y < ymax):
-                        break
-
-                return path, p
+        if 0 <= pin.x < self.width and 0 <= pin.y < self.height:
+            owner = self.margin_owner[pin.x, pin.y]
+            candidates = [self.margin_bboxes[owner]] if owner >= 0 else []
+        else:
+            # Margins past the grid edge are not indexed
+            candidates = self.margin_bboxes
+
+        x, y = pin
+
+        for xmin, ymin, xmax, ymax in candidates:
+
+            if xmin <= x < xmax and ymin <= y < ymax:
+                # Determine nearest face, with the steps needed to leave
+                # the margin through it
+                faces = (
+                    (abs(x - xmin), -1, 0, x - xmin + 1),
+                    (abs(xmax - x), 1, 0, xmax - x),
+                    (abs(y - ymin), 0, -1, y - ymin + 1),
+                    (abs(ymax - y), 0, 1, ymax - y),
+                )
+                _, dx, dy, steps = min(faces, key=lambda face: face[0])
+
+                # Straight walk out, Points are only built for the result
+                path = [Point(x + dx * k, y + dy * k) for k in range(steps + 1)]
+                return path, path[-1]
 
         return [], pin
 
     def add_component(self, comp: Component):
         self.components.append(comp)
-        comp_scale = comp + MARGIN
-        comp_int_bounding = comp_scale.int_bbox
+        self.margin_bboxes.append((comp + MARGIN).int_bbox)
 
         # Mark component area as effectively blocked
-        # Use a cost high enough that going around is ALWAYS cheaper,
-        # but low enough that we can 'escape' a pin if it starts inside.
-        OBSTACLE_COST = 100000
+        self._apply_obstacle(self.margin_bboxes[-1])
 
-        for i in range(comp_int_bounding[0], comp_int_bounding[2]):
-            for j in range(comp_int_bounding[1], comp_int_bounding[3]):
-                if 0 <= i < self.width and 0 <= j < self.height:
-                    self.grid_occupancy[i, j] += OBSTACLE_COST
+    def _apply_obstacle(self, bbox):
+        # bbox is (min_x, min_y, max_x, max_y), clipped so a negative corner
+        # does not wrap around as a NumPy slice would
+        xmin, ymin = max(0, bbox[0]), max(0, bbox[1])
+        xmax, ymax = min(self.width, bbox[2]), min(self.height, bbox[3])
+        self.obstacle[xmin:xmax, ymin:ymax] += 1
+
+        # The earliest added component keeps the cell, matching the scan order
+        owner = self.margin_owner[xmin:xmax, ymin:ymax]
+        owner[owner < 0] = len(self.components) - 1
+
+    def _grid_coords(self, coords: np.ndarray) -> np.ndarray:
+        """The rows of coords on the grid, escape stubs can end one step off it."""
+        on_grid = (coords >= 0).all(axis=1) & (coords[:, 0] < self.width) & (coords[:, 1] < self.height)
+        return coords[on_grid]
+
+    def _add_wire(self, coords: np.ndarray, amount: int):
+        # np.add.at since a path can pass the same cell more than once
+        coords = self._grid_coords(coords)
+        np.add.at(self.wire_count, (coords[:, 0], coords[:, 1]), amount)
 
     def add_net(self, pins: List[Tuple[int, int]]):
         self.nets.append([Point(x, y) for x, y in pins])
 
-    def _get_neighbors(self, current: Point):
-        neighbors = []
-        directions = [Point(1, 0), Point(-1, 0), Point(0, 1), Point(0, -1)]
-        for d in directions:
-            n = current + d
-            if 0 <= n.x < self.width and 0 <= n.y < self.height:
-                neighbors.append(n)
-        return neighbors
-
     def _decompose_multipins(self, pins: List[Point]) -> List[Tuple[Point, Point]]:
         """
         Decomposes a multi-pin net into a set of 2-pin connections using MST.
@@ -136,211 +362,329 @@ class Router:
         if len(pins) < 2:
             return []
 
-        # Create a complete graph where weights are Manhattan distances
-        G = nx.Graph()
-        for i, p1 in enumerate(pins):
-            for j, p2 in enumerate(pins):
-                if i < j:
-                    dist = abs(p1.x - p2.x) + abs(p1.y - p2.y)
-                    G.add_edge(i, j, weight=dist)
-
-        # Compute Minimum Spanning Tree
-        mst = nx.minimum_spanning_tree(G)
-
-        # Return pairs of points to connect
-        connections = []
-        for u, v in mst.edges():
-            connections.append((pins[u], pins[v]))
-        return connections
+        # Complete graph as a dense matrix of Manhattan distances
+        coords = np.array(pins)
+        dist = np.abs(coords[:, None, :] - coords[None, :, :]).sum(axis=2)
+
+        # Prim's on the dense matrix, O(n^2) with one vectorized update per
+        # added pin. Pin sets are small, no graph object is needed
+        n = len(pins)
+        in_tree = np.zeros(n, dtype=bool)
+        in_tree[0] = True
+        best_dist = dist[0].astype(float)
+        best_dist[0] = np.inf
+        parent = np.zeros(n, dtype=int)
+
+        edges = []
+        for _ in range(n - 1):
+            v = int(np.argmin(best_dist))
+            edges.append((pins[parent[v]], pins[v]))
+            in_tree[v] = True
+
+            # Closer through v than through any earlier tree pin
+            closer = (dist[v] < best_dist) & ~in_tree
+            best_dist[closer] = dist[v][closer]
+            parent[closer] = v
+            best_dist[v] = np.inf
+
+        return edges
 
     # ---------------------------------------------------------
     # 1. UPGRADED A*: Supports Multiple Targets (Steiner Zones)
     # ---------------------------------------------------------
-    def _astar_multi_target(self, start: Point, targets: Set[Point], congestion_multiplier: float):
-        pq = []
-        # Priority Queue: (f_score, g_score, current_point, last_direction)
-        heapq.heappush(pq, (0, 0, start, Point(0, 0)))
+    def _cell_cost(self, congestion_multiplier: float) -> np.ndarray:
+        """Cost of entering each cell for the current occupancy."""
+        # Widened to float32 costs like history_cost, the counts themselves
+        # would overflow
+        occupancy = self.obstacle * np.float32(OBSTACLE_COST) + self.wire_count * np.float32(WIRE_COST)
+        return np.maximum(occupancy, 0) * congestion_multiplier + self.history_cost
+
+    def _astar_multi_target(self, start: Point, targets: Set[Point], congestion_multiplier: float,
+                            cell_cost: np.ndarray | None = None, h_weight: float = 1.0):
+        # The occupancy only changes between nets, so callers routing several
+        # connections of one net pass the cost grid in instead
+        if cell_cost is None:
+            cell_cost = self._cell_cost(congestion_multiplier)
+
+        # Escape stubs of pins on a margin at the board edge end one step off
+        # the grid. Such points are never packed into cell indices, they would
+        # wrap around to the opposite edge: off grid targets are unreachable
+        # anyway, and an off grid start can only step onto the cell next to it
+        entry = None
+        start_dir = NO_DIRECTION
+        if not self._on_grid(start):
+            if start in targets:
+                return [start]
+
+            x, y = min(max(start.x, 0), self.width - 1), min(max(start.y, 0), self.height - 1)
+            if abs(x - start.x) + abs(y - start.y) != 1:
+                return None
+
+            entry = start
+            start_dir = DIRECTIONS.index((x - start.x, y - start.y))
+            start = Point(x, y)
+
+        targets = [t for t in targets if self._on_grid(t)]
+        if not targets:
+            return None
+
+        target_mask = np.zeros((self.width, self.height), dtype=bool)
+        target_mask[tuple(np.array(targets).T)] = True
+
+        # Same Manhattan to nearest target heuristic, computed for every cell
+        # at once instead of a scan over the targets per push
+        heuristic = _manhattan_field(target_mask)
+
+        # A free straight run to the nearest target is already optimal
+        path = self._straight_path(cell_cost, target_mask, start, int(heuristic[start.x, start.y]), start_dir)
+
+        distance = int(heuristic[start.x, start.y])
+        if path is None and COARSE_MIN_DISTANCE is not None and distance >= COARSE_MIN_DISTANCE:
+            corridor = self._coarse_corridor(cell_cost, target_mask, start)
+
+            if corridor is not None:
+                # Cells outside the corridor are impassable, so this route can
+                # cost more than the best one over the whole grid
+                path = _astar_core(
+                    np.where(corridor, cell_cost, np.inf).ravel().tolist(), target_mask.ravel().tolist(),
+                    heuristic.ravel().tolist(), (start.x, start.y), self.width, self.height, h_weight,
+                    start_dir=start_dir
+                )
+
+            if path is not None:
+                # Manhattan distance, plus a bend unless a target shares the
+                # start's row or column
+                bound = distance
+                if not (target_mask[start.x].any() or target_mask[:, start.y].any()):
+                    bound += BEND_PENALTY
+
+                if self._path_cost(cell_cost, target_mask, path, start_dir) > COARSE_MAX_DETOUR * bound:
+                    path = None
+
+        # Short connections, or no good route inside the corridor: search everything
+        if path is None:
+            path = _astar_core(
+                cell_cost.ravel().tolist(), target_mask.ravel().tolist(), heuristic.ravel().tolist(),
+                (start.x, start.y), self.width, self.height, h_weight, start_dir=start_dir
+            )
+
+        if path is None:
+            return None
+
+        path = [Point(x, y) for x, y in path]
+        return path if entry is None else [entry] + path
 
-        came_from = {}
-        g_scores = {(start, Point(0, 0)): 0}
+    @staticmethod
+    def _path_cost(cell_cost: np.ndarray, target_mask: np.ndarray, path, start_dir: int = NO_DIRECTION) -> float:
+        """Cost of a path the way _astar_core scores it, targets are entered for free."""
+        cells = np.array(path)
+        steps = np.diff(cells, axis=0)
+        dirs = [DIRECTIONS.index(tuple(step)) for step in steps.tolist()]
 
-        best_end_state = None
-        min_g_to_target = float('inf')
+        bends = sum(last != NO_DIRECTION and new != last for last, new in zip([start_dir] + dirs, dirs))
+        entered = cells[1:]
+        entry = np.where(target_mask[entered[:, 0], entered[:, 1]], 0, cell_cost[entered[:, 0], entered[:, 1]])
 
-        while pq:
-            f, g, current, last_dir = heapq.heappop(pq)
+        return len(dirs) * BASE_COST + bends * BEND_PENALTY + float(entry.sum())
 
-            if g >= min_g_to_target:
+    def _on_grid(self, p) -> bool:
+        return 0 <= p[0] < self.width and 0 <= p[1] < self.height
+
+    def _straight_path(self, cell_cost: np.ndarray, target_mask: np.ndarray, start: Point, distance: int,
+                       start_dir: int = NO_DIRECTION):
+        """
+        Straight path to a target distance cells away along a row or column,
+        or None. Only taken when every cell before the target is free: it then
+        costs exactly the Manhattan lower bound, so no search can beat it.
+        A path arriving at start with start_dir only goes straight on.
+        """
+        for d in MOVES:
+            if start_dir != NO_DIRECTION and d != start_dir:
                 continue
+            dx, dy = DIRECTIONS[d]
+            end_x, end_y = start.x + dx * distance, start.y + dy * distance
 
-            if current in targets:
-                if g < min_g_to_target:
-                    min_g_to_target = g
-                    best_end_state = (current, last_dir)
+            if not (0 <= end_x < self.width and 0 <= end_y < self.height) or not target_mask[end_x, end_y]:
                 continue
 
-            for neighbor in self._get_neighbors(current):
-                new_dir = neighbor - current
+            steps = np.arange(1, distance)
+            if not cell_cost[start.x + dx * steps, start.y + dy * steps].any():
+                return [(start.x + dx * k, start.y + dy * k) for k in range(distance + 1)]
 
-                # 1. Base Cost
-                step_cost = BASE_COST
-                if last_dir != Point(0, 0) and new_dir != last_dir:
-                    step_cost += BEND_PENALTY
+        return None
 
-                # 2. Congestion Cost
-                occ = max(0, self.grid_occupancy[neighbor.x, neighbor.y])
-                hist = self.history_cost[neighbor.x, neighbor.y]
+    def _coarse_corridor(self, cell_cost: np.ndarray, target_mask: np.ndarray, start: Point):
+        """
+        Global routing pass on COARSE_TILE sized tiles.
+        Returns the fine cells of the tiles along the coarse route, grown by
+        one tile, or None if the coarse route fails.
+        """
+        t = COARSE_TILE
+        cw, ch = -(-self.width // t), -(-self.height // t)
+        pad = ((0, cw * t - self.width), (0, ch * t - self.height))
 
-                # CRITICAL FIX: Pin Exemption
-                # If the neighbor is a target, we ignore its occupancy cost.
-                # This allows the wire to 'dock' into a pin located inside a red margin.
-                if neighbor in targets:
-                    congestion_cost = 0
-                else:
-                    congestion_cost = (occ * congestion_multiplier) + hist
-
-                new_g = g + step_cost + congestion_cost
-
-                if new_g < g_scores.get((neighbor, new_dir), float('inf')):
-                    g_scores[(neighbor, new_dir)] = new_g
-                    h = min(abs(neighbor.x - t.x) + abs(neighbor.y - t.y) for t in targets)
-                    heapq.heappush(pq, (new_g + h, new_g, neighbor, new_dir))
-                    came_from[(neighbor, new_dir)] = (current, last_dir)
-
-        if best_end_state:
-            path = []
-            curr, direction = best_end_state
-            while curr != start:
-                path.append(curr)
-                if (curr, direction) not in came_from: break
-                prev_node, prev_dir = came_from[(curr, direction)]
-                curr = prev_node
-                direction = prev_dir
-            path.append(start)
-            return path[::-1]
+        # A tile costs roughly COARSE_TILE times its average cell to cross
+        tile_cost = np.pad(cell_cost, pad, mode='edge').reshape(cw, t, ch, t).mean(axis=(1, 3)) * t
+        tile_target = np.pad(target_mask, pad).reshape(cw, t, ch, t).any(axis=(1, 3))
 
-        return None
+        tiles = _astar_core(
+            tile_cost.ravel().tolist(), tile_target.ravel().tolist(), _manhattan_field(tile_target).ravel().tolist(),
+            (start.x // t, start.y // t), cw, ch
+        )
+
+        if tiles is None:
+            return None
+
+        route = np.zeros((cw, ch), dtype=bool)
+        route[tuple(np.array(tiles).T)] = True
+
+        # Grow by one tile so the fine route can still bend around local congestion
+        grown = route.copy()
+        grown[1:] |= route[:-1]
+        grown[:-1] |= route[1:]
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+
+        return np.repeat(np.repeat(grown, t, axis=0), t, axis=1)[:self.width, :self.height]
 
     # ---------------------------------------------------------
     # 2. NEW ROUTING LOGIC: Iterative Steiner Construction
     # ---------------------------------------------------------
-    def route(self):
+    def _route_net(self, pins: List[Point], congestion_multiplier: float, h_weight: float = 1.0) -> List[Point]:
+        """Routes one net against the current occupancy, its own wires must be ripped up."""
+        # Fixed while this net is routed
+        cell_cost = self._cell_cost(congestion_multiplier)
+
+        # ---- NEW: escape first pin ----
+        escape_path, escape_point = self._pin_escape(pins[0])
+        routed_pixels = set(escape_path)
+        full_net_path = list(escape_path)
+
+        routed_pixels.add(escape_point)
+
+        # Distance from every unconnected pin to the routed tree, only
+        # refreshed against the pixels added since the last pick
+        unconnected_pins = list(set(pins[1:]))
+        pin_coords = np.array(unconnected_pins).reshape(-1, 2)
+        nearest = np.full(len(unconnected_pins), np.inf)
+        connected = np.zeros(len(unconnected_pins), dtype=bool)
+        new_pixels = escape_path + [escape_point]
+
+        for _ in range(len(unconnected_pins)):
+            nearest = np.minimum(nearest, _manhattan_to_nearest(pin_coords, new_pixels))
+            nearest[connected] = np.inf
+
+            # First closest pin in set order, like the original linear scan
+            best = int(np.argmin(nearest))
+            best_pin = unconnected_pins[best]
+
+            # ---- NEW: escape target pin first ----
+            escape_path, escaped_pin = self._pin_escape(best_pin)
+            path = self._astar_multi_target(
+                escaped_pin,
+                routed_pixels,
+                congestion_multiplier,
+                cell_cost,
+                h_weight
+            )
+
+            if path:
+                # Add escape stub, then the A* path
+                new_pixels = escape_path + path
+                routed_pixels.update(new_pixels)
+                full_net_path.extend(new_pixels)
+                connected[best] = True
+            else:
+                break
+
+        return full_net_path
+
+    def _rip_up(self, net_id: int):
+        if net_id in self.routed_coords:
+            self._add_wire(self.routed_coords[net_id], -1)
+
+    def _store_net(self, net_id: int, full_net_path: List[Point]):
+        self.routed_paths[net_id] = full_net_path
+        self.routed_coords[net_id] = np.array(full_net_path, dtype=np.int32).reshape(-1, 2)
+        self._add_wire(self.routed_coords[net_id], 1)
+
+    def route(self, workers: int | None = None):
+        """
+        With workers > 1 the nets of an iteration are routed in parallel
+        processes against the occupancy snapshot at the start of the iteration,
+        instead of each net seeing the nets routed before it. Results are then
+        applied in net order. Nets no longer dodge each other within an
+        iteration, so the overlap count does not settle the way the serial
+        negotiation does and can swing between iterations. Both modes end on
+        the paths of the iteration with the fewest overlaps, not the last one.
+        """
         congestion_multiplier = 0.5
         print(f"Starting Steiner Routing for {len(self.nets)} nets...")
 
+        # Paths and occupancy of the iteration with the fewest overlaps so far
+        best_overlaps = None
+        best = None
+
         for iteration in range(MAX_ITERATIONS):
-            # 1. Clear Occupancy
-            self.grid_occupancy.fill(0)
-
-            # 2. Re-apply Component Obstacles (High Cost)
-            OBSTACLE_COST = 100000
-            for c in self.components:
-                c_scale = c + MARGIN
-                bbox = c_scale.int_bbox
-                # Use slicing for speed
-                # Note: bbox is (min_x, min_y, max_x, max_y)
-                # Numpy slicing is [min_x:max_x, min_y:max_y]
-                self.grid_occupancy[bbox[0]:bbox[2], bbox[1]:bbox[3]] += OBSTACLE_COST
-
-            # 3. Re-apply Net Occupancy from previous iteration (for negotiations)
+            # 1. Clear Occupancy and 2. Re-apply Net Occupancy from previous
+            # iteration (for negotiations), fused into one counting pass.
+            # Component obstacles are static and live in their own array.
             # We want wires to negotiate with OTHER wires, but never with components.
-            # So wires add a smaller cost (e.g., 1) compared to components (100,000)
-            for net_id, path in self.routed_paths.items():
-                for p in path:
-                    self.grid_occupancy[p.x, p.y] += 100  # Wire overlap cost
+            # So wires add a smaller cost (WIRE_COST) compared to components (OBSTACLE_COST)
+            coords = self._grid_coords(np.concatenate([np.empty((0, 2), dtype=np.int32), *self.routed_coords.values()]))
+            counts = np.bincount(coords[:, 0] * self.height + coords[:, 1], minlength=self.width * self.height)
+            np.copyto(self.wire_count, counts.reshape(self.width, self.height))
 
             current_overlaps = 0
 
-            # 4. Route Each Net
-            for net_id, pins in enumerate(self.nets):
-                if not pins: continue
-
-                # Rip-up current net from occupancy to route it fresh
-                if net_id in self.routed_paths:
-                    for p in self.routed_paths[net_id]:
-                        self.grid_occupancy[p.x, p.y] -= 100
-
-                routed_pixels = set()
-                full_net_path = []
-
-                # ---- NEW: escape first pin ----
-                escape_path, escape_point = self._pin_escape(pins[0])
-                for p in escape_path:
-                    routed_pixels.add(p)
-                    full_net_path.append(p)
-
-                routed_pixels.add(escape_point)
-                unconnected_pins = set(pins[1:])
-
-                while unconnected_pins:
-                    best_pin = None
-                    best_dist = float('inf')
-
-                    for p in unconnected_pins:
-                        d = min(abs(p.x - rp.x) + abs(p.y - rp.y) for rp in routed_pixels)
-                        if d < best_dist:
-                            best_dist = d
-                            best_pin = p
-
-                    # ---- NEW: escape target pin first ----
-                    escape_path, escaped_pin = self._pin_escape(best_pin)
-                    path = self._astar_multi_target(
-                        escaped_pin,
-                        routed_pixels,
-                        congestion_multiplier
-                    )
-
-                    if path:
-                        # Add escape stub
-                        for p in escape_path:
-                            routed_pixels.add(p)
-                            full_net_path.append(p)
-
-                        # Add A* path
-                        for p in path:
-                            routed_pixels.add(p)
-                            full_net_path.append(p)
-
-                        unconnected_pins.remove(best_pin)
-                    else:
-                        break
-
-                self.routed_paths[net_id] = full_net_path
-
-                # Re-apply occupancy
-                for p in full_net_path:
-                    self.grid_occupancy[p.x, p.y] += 100
-
-            # 5. Check Congestion
-            # We only care about Wire-Wire overlaps (value > 100 but < OBSTACLE_COST)
-            # Or strict overlaps where value > 100 (implies 2 wires)
-            # Component overlap is technically allowed (value > 100000) only for escape
-
-            # Simple overlap check: finding cells with > 1 wire
-            # Since 1 wire = 100, 2 wires = 200. Components are 100000.
-            # We check modulo or ranges.
-
-            overlaps = []
-            for x in range(self.width):
-                for y in range(self.height):
-                    val = self.grid_occupancy[x, y]
-                    # If val > 100000: It's a component.
-                    # If val % 100000 > 100: It implies > 1 wire is here.
-                    wire_cost = val % 100000
-                    if wire_cost > 100:  # More than 1 wire (each wire is 100)
-                        overlaps.append((x, y))
-
-            current_overlaps = len(overlaps)
+            # Greedy early iterations, closer to optimal paths as the
+            # negotiation settles
+            h_weight = HEURISTIC_WEIGHT + (1 - HEURISTIC_WEIGHT) * iteration / max(MAX_ITERATIONS - 1, 1)
+
+            # 3. Route Each Net
+            net_ids = [net_id for net_id, pins in enumerate(self.nets) if pins]
+
+            if not workers or workers <= 1:
+                for net_id in net_ids:
+                    # Rip-up current net from occupancy to route it fresh
+                    self._rip_up(net_id)
+                    self._store_net(net_id, self._route_net(self.nets[net_id], congestion_multiplier, h_weight))
+            else:
+                # A pool per iteration, so each worker receives the iteration's
+                # snapshot once rather than the router being pickled per net
+                with ProcessPoolExecutor(workers, initializer=_init_route_worker, initargs=(self,)) as pool:
+                    paths = list(pool.map(_route_net_snapshot, net_ids, repeat(congestion_multiplier), repeat(h_weight)))
+
+                for net_id, full_net_path in zip(net_ids, paths):
+                    self._rip_up(net_id)
+                    self._store_net(net_id, full_net_path)
+
+            # 4. Check Congestion
+            # We only care about Wire-Wire overlaps, cells with > 1 wire.
+            # Component overlap is technically allowed only for escape
+            overlap_mask = self.wire_count > 1
+
+            current_overlaps = np.count_nonzero(overlap_mask)
             print(f"  Iteration {iteration + 1}: Overlaps: {current_overlaps}")
 
+            # Ties go to the later iteration. _store_net() replaces entries
+            # rather than mutating them, so shallow copies are enough
+            if best_overlaps is None or current_overlaps <= best_overlaps:
+                best_overlaps = current_overlaps
+                best = (dict(self.routed_paths), dict(self.routed_coords), self.wire_count.copy())
+
             if current_overlaps == 0:
                 break
 
-            for x, y in overlaps:
-                self.history_cost[x, y] += 10 * (iteration + 1)
+            self.history_cost[overlap_mask] += 10 * (iteration + 1)
 
             congestion_multiplier *= 1.5
 
+        if best is not None and best_overlaps < current_overlaps:
+            print(f"  Keeping the paths of the best iteration, Overlaps: {best_overlaps}")
+            self.routed_paths, self.routed_coords, wire_count = best
+            np.copyto(self.wire_count, wire_count)
+
     def _extract_segments(self):
         """
         Returns a list of segments:
@@ -414,35 +758,21 @@ class Router:
 
         # Draw Routes
         colors = plt.cm.jet(np.linspace(0, 1, len(self.nets)))
+        # Wires of every net, drawn by one LineCollection instead of a plot call each
+        wires = []
+        wire_colors = []
 
         for net_id, path in self.routed_paths.items():
             if not path: continue
 
-            segments = [[]]
-
-            prev_point = path[0]
-
-            segement_counter = 0
+            coords = self.routed_coords[net_id]
 
-            segments[segement_counter].append(prev_point)
+            # A new segment starts wherever the path jumps, i.e. neither x nor y is shared
+            jumps = np.all(np.diff(coords, axis=0) != 0, axis=1)
+            segments = np.split(coords, np.flatnonzero(jumps) + 1)
 
-            for i in range(1, len(path)):
-                new_point = path[i]
-
-                if not (new_point.x == prev_point.x or new_point.y == prev_point.y):
-                    segement_counter += 1
-                    segments.append([])
-
-                prev_point = new_point
-
-                segments[segement_counter].append(new_point)
-
-            for g in segments:
-                xs = [p.x for p in g]
-                ys = [p.y for p in g]
-
-                # Draw wires
-                ax.plot(xs, ys, color=colors[net_id], linewidth=2.5, alpha=0.8, zorder=1)
+            wires.extend(segments)
+            wire_colors.extend([colors[net_id]] * len(segments))
 
             # Draw pins
             pins = self.nets[net_id]
@@ -452,18 +782,23 @@ class Router:
 
             connections = []
 
-            for g in segments:
-                if len(pins) <= 2:
-                    continue
-
-                for i in [0, -1]:
-                    if g[i] not in pins:
-                        connections.append(g[i])
+            if len(pins) > 2:
+                for g in segments:
+                    for i in [0, -1]:
+                        end = Point(*g[i].tolist())
+                        if end not in pins:
+                            connections.append(end)
 
             px = [p.x for p in connections]
             py = [p.y for p in connections]
             ax.scatter(px, py, color=colors[net_id], s=100, edgecolors='black', zorder=3, label=f'Net {net_id}')
 
+        # Draw wires
+        ax.add_collection(LineCollection(
+            wires, colors=wire_colors, linewidths=2.5, alpha=0.8, zorder=1,
+            capstyle="projecting", joinstyle="round"
+        ))
+
         crossings = self.find_crossings()
 
         if crossings:
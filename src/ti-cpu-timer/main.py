@@ -7,7 +7,7 @@ from visual_circuit import VisualBlock, VisualGate, VisualWire, same_y, same_x,
 sys.path.append('../')
 
 from circuit import Circuit, Clock
-from ti_timer import LogicGate, NOT, Register, CPUTimerCounter
+from ti_timer import AND, OR, NOT, Register, CPUTimerCounter
 
 
 class CPUTimerAnimation(Scene):
@@ -19,10 +19,12 @@ class CPUTimerAnimation(Scene):
 
         # Components
         clk = Clock("SYSCLK", period=period)
-        reset_or = LogicGate("Reset_OR", lambda a, b: a or b)
-        pre_or = LogicGate("Pre_OR", lambda a, b: a or b)
-        main_or = LogicGate("Main_OR", lambda a, b: a or b)
-        gate_and = LogicGate("Gate_AND", lambda a, b: a and b)
+        # Batched gates, the circuit evaluates every active one of a kind with
+        # a single kernel call instead of a Python lambda per gate
+        reset_or = OR("Reset_OR")
+        pre_or = OR("Pre_OR")
+        main_or = OR("Main_OR")
+        gate_and = AND("Gate_AND")
         inv = NOT("INV")
 
         tddr = Register("TDDR", 2)
@@ -55,7 +57,6 @@ class CPUTimerAnimation(Scene):
         c.poke("INV", "in", 0)  # TCR.4 = 0 (Enabled)
         c.poke("Reset_OR", "A", 0)
         c.poke("Reset_OR", "B", 0)
-        c.schedule("SYSCLK", 0)
 
         # --- B. Layout Visuals ---
         # Coordinates map roughly to the diagram provided
@@ -180,53 +181,98 @@ class CPUTimerAnimation(Scene):
             v_tddr, v_psc, v_prd, v_tim, v_reset_or, v_pre_or, v_main_or, v_and, v_not
         ]
 
-        # Add everything to scene
-        self.play(*map(Create, all_), run_tim=5)
+        visual_wires = list(signal_map.values())
+        visual_blocks = list(component_map.values())
+        # Pin ids of every mapped signal, resolved once. Each step gathers them
+        # from the circuit's value array instead of two dict lookups a signal
+        wire_pins = np.array([c.pin_of[key] for key in signal_map], dtype=np.intp)
+        out_pins = np.array([c.pin_of[name, "out"] for name in component_map], dtype=np.intp)
+        load_pins = np.array([c.pin_of[name, "load"] for name in component_map], dtype=np.intp)
+
+        # --- C. Simulate ---
+        # The whole run is simulated up front into one row of states per step,
+        # the render loop below only replays it
+        num_steps = 60 * 1
+
+        # Pokes applied at the end of a step
+        pokes = {
+            2: ("Reset_OR", "A", 0),  # Reset logic (Pulse reset for a few frames then drop)
+            40: ("INV", "in", 1),
+            47: ("Reset_OR", "A", 1),  # Trigger Reset
+            50: ("INV", "in", 0),
+            58: ("Reset_OR", "A", 0),
+        }
 
-        self.add(*all_)
+        wire_states = np.zeros((num_steps, len(wire_pins)), dtype=bool)
+        counter_vals = np.zeros((num_steps, len(out_pins)), dtype=int)
+        load_states = np.zeros((num_steps, len(load_pins)), dtype=bool)
+
+        # A step advances time by at most one unit, so the run never gets past
+        # num_steps and its clock ticks are scheduled in one go up front
+        clk.prefill(c, num_steps)
 
         # 1. Reset Pulse
-        self.wait(1)
         c.poke("Reset_OR", "A", 1)  # Trigger Reset
 
-        # We run the simulation in small steps and update visuals
-        for step in range(60 * 1):
+        # We run the simulation in small steps and record the visuals' inputs
+        for step in range(num_steps):
             c.run(steps=1)
 
-            # Reset logic (Pulse reset for a few frames then drop)
-            if step == 2: c.poke("Reset_OR", "A", 0)
+            if step in pokes:
+                c.poke(*pokes[step])
 
-            if step == 40:
-                c.poke("INV", "in", 1)
+            values = c.values
+            wire_states[step] = values[wire_pins] != 0
+            counter_vals[step] = values[out_pins]
+            load_states[step] = values[load_pins] != 0
 
-            if step == 47:
-                c.poke("Reset_OR", "A", 1)  # Trigger Reset
+        # The first step restyles every wire and block: with ANIMATE the
+        # constructors' set_active(False) only builds a target that is never
+        # played. From then on only those whose signal flipped are restyled
+        wire_flips = wire_states != np.vstack([~wire_states[:1], wire_states[:-1]])
+        load_flips = load_states != np.vstack([~load_states[:1], load_states[:-1]])
+        # Counters start out showing their block's initial value
+        initial_vals = np.array([[visual_block.current_val for visual_block in visual_blocks]])
+        count_changes = counter_vals != np.vstack([initial_vals, counter_vals[:-1]])
 
-            if step == 50:
-                c.poke("INV", "in", 0)
+        # Steps where nothing visible changes, the replay only waits through them
+        quiet = ~(wire_flips.any(axis=1) | load_flips.any(axis=1) | count_changes.any(axis=1))
 
-            if step == 58:
-                c.poke("Reset_OR", "A", 0)
+        # Add everything to scene
+        self.play(*map(Create, all_), run_time=5)
 
-            animations = []
-            # Update Wires
-            for (comp_name, sig_name), visual_wire in signal_map.items():
-                visual_wire: VisualGroup
+        self.add(*all_)
 
-                val = c.components[comp_name].signals[sig_name].value
-                animations.extend(visual_wire.set_active(True if val else False))
+        # Hold the idle circuit before the reset pulse
+        self.wait(1)
 
-            # Update Counters text
-            for comp_name, visual_block in component_map.items():
-                comp_signals = c.components[comp_name].signals
+        # --- D. Replay ---
+        for step in range(num_steps):
+            if quiet[step]:
+                # Same time as a step that animates
+                self.wait(2 if get_animate() else 1)
+                continue
 
-                val = comp_signals["out"].value
-                visual_block.update_val(val)
-                # Flash block if loading
-                is_loading = comp_signals["load"].value
-                animations.append(visual_block.set_active(is_loading))
+            animations = []
+            # Update Wires
+            active = wire_states[step]
+            for i in np.flatnonzero(wire_flips[step]):
+                animations.extend(visual_wires[i].set_active(bool(active[i])))
 
-            if get_animate() and animations:
-                self.play(*animations)
+            # Update Counters text
+            for i in np.flatnonzero(count_changes[step]):
+                visual_blocks[i].update_val(int(counter_vals[step, i]))
+
+            # Flash block if loading
+            loading = load_states[step]
+            for i in np.flatnonzero(load_flips[step]):
+                animations.extend(visual_blocks[i].set_active(bool(loading[i])))
+
+            if get_animate():
+                # A step where nothing flipped still takes the same time
+                if animations:
+                    self.play(*animations)
+                else:
+                    self.wait()
 
             self.wait(1)
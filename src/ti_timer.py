@@ -1,4 +1,7 @@
-from circuit import Component, Circuit
+import numpy as np
+
+# The gates are the circuit's own batched AND / OR, re-exported here
+from circuit import AND, OR, Component, Circuit
 
 
 class Register(Component):
@@ -6,8 +9,7 @@ class Register(Component):
 
     def __init__(self, name, value):
         super().__init__(name, [], ["out"])
-        self.signals["out"].value = value  # Pre-initialize
-        self.signals["out"].next_value = value
+        self.initial["out"] = value  # Pre-initialize
 
     def evaluate(self):
         # Register output is constant unless manually poked,
@@ -21,17 +23,30 @@ class LogicGate(Component):
         self.op = op
 
     def evaluate(self):
-        self["out"].set_next(1 if self.op(self["A"].value, self["B"].value) else 0)
+        # Inputs as logic levels, so op sees 0 / 1 (or False / True) and the
+        # low bit of its result is the output, no truth test on the result
+        self["out"].set_next(self.op(self["A"].value != 0, self["B"].value != 0) & 1)
 
 
 class NOT(Component):
     """Inverter for TCR.4 logic."""
 
+    __slots__ = ()
+
+    batched = True
+
+    IN_IDX, OUT_IDX = 0, 1
+
     def __init__(self, name):
         super().__init__(name, ["in"], ["out"])
 
     def evaluate(self):
-        self["out"].set_next(1 - self["in"].value)
+        s = self._signals
+        s[self.OUT_IDX].set_next(1 - s[self.IN_IDX].value)
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        circuit.next_values[pins[:, cls.OUT_IDX]] = 1 - circuit.values[pins[:, cls.IN_IDX]]
 
 class LED(Component):
     """Inverter for TCR.4 logic."""
@@ -43,86 +58,113 @@ class LED(Component):
         self['state'].set_next(self['in'].value > self['out'].value)
 
 
-class OR(Component):
-    def __init__(self, name):
-        super().__init__(name, ["A", "B"], ["out"])
-
-    def evaluate(self):
-        self["out"].set_next(1 if (self["A"].value or self["B"].value) else 0)
-
-
-class AND(Component):
-    def __init__(self, name):
-        super().__init__(name, ["A", "B"], ["out"])
-
-    def evaluate(self):
-        self["out"].set_next(1 if (self["A"].value and self["B"].value) else 0)
-
-
 class CPUTimerCounter(Component):
     """
     Generic Down-Counter for both Prescaler and Main Timer.
     - 'clk' input is the trigger (SYSCLK for Prescaler, Borrow for Main).
     - 'load' is the async/sync load signal.
     - 'borrow' is the output pulse when count == 0.
+    The count and previous clock live on state pins, so every counter of a
+    circuit advances in one batched pass.
     """
 
+    __slots__ = ()
+
+    batched = True
+
+    CLK_IDX, LOAD_IDX, DIN_IDX, OUT_IDX, BORROW_IDX, COUNT_IDX, PREV_CLK_IDX = range(7)
+
+    # In hardware, this usually wraps to Max, but here the load logic handles
+    # the reload via feedback. Counts are 16 bit, so 0 - 1 wraps to 0xFFFF
+    COUNT_MASK = 0xFFFF
+
     def __init__(self, name, start_val=0):
-        super().__init__(name, ["clk", "load", "din"], ["out", "borrow"])
-        self.state = start_val
-        self.prev_clk = 0
+        super().__init__(name, ["clk", "load", "din"], ["out", "borrow"], state_pins=["count", "prev_clk"])
+        self.initial["count"] = start_val
 
     def evaluate(self):
-        clk = self["clk"].value
-        load = self["load"].value
-        din = self["din"].value
+        s = self._signals
+        clk = s[self.CLK_IDX].value
+        count = s[self.COUNT_IDX].value
 
         # Rising Edge Detection
-        if self.prev_clk == 0 and clk == 1:
-            if load:
-                self.state = din
+        if s[self.PREV_CLK_IDX].value == 0 and clk == 1:
+            if s[self.LOAD_IDX].value:
+                count = s[self.DIN_IDX].value
             else:
-                if self.state == 0:
-                    # In hardware, this usually wraps to Max,
-                    # but here the load logic handles the reload via feedback.
-                    # We'll wrap to 0xFFFF (simplification) or just decrement.
-                    self.state = 0xFFFF
-                else:
-                    self.state -= 1
+                count = (count - 1) & self.COUNT_MASK
 
-        self.prev_clk = clk
+        s[self.PREV_CLK_IDX].set_next(clk)
+        s[self.COUNT_IDX].set_next(count)
 
         # Output Logic
-        self["out"].set_next(self.state)
+        s[self.OUT_IDX].set_next(count)
         # Borrow is active High when state is 0.
         # This drives the feedback loop to reload on the NEXT clock.
-        self["borrow"].set_next(1 if self.state == 0 else 0)
+        s[self.BORROW_IDX].set_next(int(count == 0))
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        values = circuit.values
+        next_values = circuit.next_values
+
+        clk = values[pins[:, cls.CLK_IDX]]
+        count = values[pins[:, cls.COUNT_IDX]]
+
+        rising = (values[pins[:, cls.PREV_CLK_IDX]] == 0) & (clk == 1)
+        reloaded = np.where(values[pins[:, cls.LOAD_IDX]] != 0, values[pins[:, cls.DIN_IDX]], (count - 1) & cls.COUNT_MASK)
+        count = np.where(rising, reloaded, count)
+
+        next_values[pins[:, cls.PREV_CLK_IDX]] = clk
+        next_values[pins[:, cls.COUNT_IDX]] = count
+        next_values[pins[:, cls.OUT_IDX]] = count
+        next_values[pins[:, cls.BORROW_IDX]] = count == 0
 
 
 class SystemClock(Component):
     def __init__(self, name, period=2):
         super().__init__(name, [], ["clk"])
-        self.period = period
+        self.period = int(period)
+        # Time between two edges, fixed for the clock's lifetime
+        self.half_period = self.period // 2
 
     def evaluate(self):
         self["clk"].set_next(1 - self["clk"].value)
 
     def next_events(self, t):
-        return [(t + self.period // 2, self.name)]
+        return [(t + self.half_period, self.name)]
 
 
 class Mux(Component):
-    """Generic N-way Multiplexer."""
+    """Generic N-way Multiplexer, an out of range select holds the output."""
+
+    __slots__ = ()
+
+    batched = True
+
+    # Pins are in0 .. in{N-1}, sel, out, so the data inputs sit at their own index
+    SEL_IDX, OUT_IDX = -2, -1
 
     def __init__(self, name: str, num_inputs: int):
         inputs = [f"in{i}" for i in range(num_inputs)] + ["sel"]
         super().__init__(name, inputs, ["out"])
 
     def evaluate(self):
-        sel = self["sel"].value
-        input_key = f"in{sel}"
-        if input_key in self.signals:
-            self["out"].set_next(self[input_key].value)
+        s = self._signals
+        sel = s[self.SEL_IDX].value
+        if 0 <= sel < len(s) - 2:
+            s[self.OUT_IDX].set_next(s[sel].value)
+
+    @classmethod
+    def evaluate_batch(cls, circuit, pins, params):
+        values = circuit.values
+        sel = values[pins[:, cls.SEL_IDX]]
+        valid = (sel >= 0) & (sel < pins.shape[1] - 2)
+
+        # Invalid selects gather a dummy input and keep the pending output
+        picked = values[pins[np.arange(len(pins)), np.where(valid, sel, 0)]]
+        out = pins[:, cls.OUT_IDX]
+        circuit.next_values[out] = np.where(valid, picked, circuit.next_values[out])
 
 
 class InputQualifier(Component):
@@ -134,9 +176,15 @@ class InputQualifier(Component):
     Mode 11: Async (Pass-through)
     """
 
+    HISTORY_SIZE = 6
+
     def __init__(self, name: str):
         super().__init__(name, ["in", "mode", "clk"], ["out"])
-        self.history = []
+        # Ring buffer of the last HISTORY_SIZE samples, head is the next slot
+        # to write and count how many of the newest slots are in the window
+        self.history = [0] * self.HISTORY_SIZE
+        self.head = 0
+        self.count = 0
 
     def evaluate(self):
         mode = self["mode"].value
@@ -148,13 +196,18 @@ class InputQualifier(Component):
             self["out"].set_next(val)
         else:  # Sampling modes
             samples = 3 if mode == 1 else 6
-            self.history.append(val)
-            if len(self.history) > samples:
-                self.history.pop(0)
+            size = self.HISTORY_SIZE
+            self.history[self.head] = val
+            self.head = (self.head + 1) % size
+            # Grows by one up to the window, the oldest sample drops once full.
+            # A window shrunk by a mode change is not trimmed, as before
+            self.count = min(self.count + 1, max(self.count, samples))
 
             # If all samples in history are identical, update output
-            if len(self.history) == samples and all(x == self.history[0] for x in self.history):
-                self["out"].set_next(self.history[0])
+            if self.count == samples and all(
+                self.history[(self.head - k) % size] == val for k in range(2, samples + 1)
+            ):
+                self["out"].set_next(val)
 
 
 class GPIODataLogic(Component):
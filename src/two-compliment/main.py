@@ -1,28 +1,54 @@
+from functools import lru_cache
+
 from manim import *
 
 
+@lru_cache(maxsize=None)
 def bits_to_string(x: int, n: int) -> str:
     """Return string of bits for an unsigned value x in n bits."""
     return format(x & ((1 << n) - 1), f"0{n}b")
 
 
+# Prototypes for bit_boxes, every box is a copy so the text is laid out only
+# once per digit instead of once per box. Built on first use, not at import
+@lru_cache(maxsize=None)
+def _bit_glyph(ch: str) -> VMobject:
+    # The digit's own path, without the Text group around it. A box stays a
+    # (square, digit) pair for the indexing below, one node smaller per bit
+    return Text(ch, font_size=24)[0]
+
+
+@lru_cache(maxsize=None)
+def _bit_square(bit_size: float) -> Square:
+    return Square(side_length=bit_size, stroke_width=2, color=BLUE)
+
+
+def twos_complement(x: int, n: int) -> tuple[int, int, int]:
+    """
+    Returns (~x, ~x + 1, carry_bits) in n bits, where carry_bits is how many
+    low bits the carry walk of the animation visits: none when ~x ends in 0,
+    else its trailing ones plus the bit the carry stops at.
+    """
+    mask = (1 << n) - 1
+    inverted = ~x & mask
+    trailing_ones = (~inverted & (inverted + 1)).bit_length() - 1
+    carry_bits = min(trailing_ones + 1, n) if inverted & 1 else 0
+    return inverted, (inverted + 1) & mask, carry_bits
+
+
 def bit_boxes(bit_string: str, bit_size: float = 0.5, buff: float = 0.05) -> VGroup:
     """Returns a VGroup of square boxes with the bits centered inside."""
+    # Both prototypes are centered on the origin, so each box is placed with a
+    # plain shift, centered on the origin like arrange would leave it
+    step = bit_size + buff
+    x = -(len(bit_string) - 1) * step / 2
     boxes = VGroup()
     for ch in bit_string:
-        sq = Square(side_length=bit_size, stroke_width=2, color=BLUE)
-        bit = Text(ch, font_size=24)
-        bit.move_to(sq.get_center())
-        boxes.add(VGroup(sq, bit))
-    boxes.arrange(RIGHT, buff=buff)
+        offset = RIGHT * x
+        boxes.add(VGroup(_bit_square(bit_size).copy().shift(offset), _bit_glyph(ch).copy().shift(offset)))
+        x += step
     return boxes
 
-def same_y(target, val):
-    val = val[:]
-    val[1] = target[1]
-
-    return val
-
 
 class TwoComplement(Scene):
     def construct(self):
@@ -111,11 +137,10 @@ class TwoComplement(Scene):
         self.play(Write(demo_explanation))
         self.wait(1)
 
-        # Clear some space for the bit demonstration
+        # Clear some space for the bit demonstration. Each cleanup fades one
+        # group, a single animation instead of one per mobject
         self.play(
-            FadeOut(step1), FadeOut(arrow1), FadeOut(step2),
-            FadeOut(arrow2), FadeOut(all_ones), FadeOut(arrow3),
-            FadeOut(demo_explanation)
+            FadeOut(VGroup(step1, arrow1, step2, arrow2, all_ones, arrow3, demo_explanation))
         )
 
         # Show bit-level demonstration
@@ -134,6 +159,8 @@ class TwoComplement(Scene):
         all_ones_boxes = bit_boxes(all_ones_bits, bit_size=0.5)
         all_ones_group = VGroup(all_ones_label, all_ones_boxes).arrange(RIGHT, buff=0.3)
         all_ones_group.shift(UP * 1.2)
+        # The rows below are lined up on this x, it does not move afterwards
+        x_ref = all_ones_boxes.get_center()[0]
 
         self.play(Write(all_ones_label))
         self.play(Create(all_ones_boxes, lag_ratio=0.1, run_time=1.5))
@@ -149,7 +176,7 @@ class TwoComplement(Scene):
         x_group.shift(UP * 0.1)
 
 
-        x_group.shift([(all_ones_boxes.get_center() - x_boxes.get_center())[0], 0 , 0])
+        x_group.shift([x_ref - x_boxes.get_x(), 0, 0])
 
 
         self.play(Write(minus_sign))
@@ -166,25 +193,30 @@ class TwoComplement(Scene):
         self.play(Create(equals_line))
 
         # Perform subtraction bit by bit with animation
-        result_bits = ''.join('1' if b == '0' else '0' for b in x_bits)  # This is ~x
+        result_bits = bits_to_string(~x_demo, N_demo)  # This is ~x
         result_boxes = bit_boxes(result_bits, bit_size=0.5)
         result_label = MathTex(r"= \sim x =")
         result_group = VGroup(result_label, result_boxes).arrange(RIGHT, buff=0.3)
         result_group.shift(DOWN * 1)
 
-        result_group.shift([(all_ones_boxes.get_center() - result_boxes.get_center())[0],0 , 0])
+        result_group.shift([x_ref - result_boxes.get_x(), 0, 0])
 
-        # Animate each bit of the result appearing with corresponding bits highlighted
+        # Animate each bit of the result appearing with corresponding bits highlighted.
+        # The bits play one after another inside a single play() call
         self.play(Write(result_label))
-        for i in range(N_demo):
-            # Highlight the bits being operated on
-            self.play(
-                Indicate(all_ones_boxes[i], color=YELLOW),
-                Indicate(x_boxes[i], color=YELLOW),
-                run_time=0.3
+        self.play(Succession(*[
+            Succession(
+                # Highlight the bits being operated on
+                AnimationGroup(
+                    Indicate(all_ones_boxes[i], color=YELLOW),
+                    Indicate(x_boxes[i], color=YELLOW),
+                    run_time=0.3
+                ),
+                # Show the result bit
+                FadeIn(result_boxes[i], shift=UP * 0.2, run_time=0.3)
             )
-            # Show the result bit
-            self.play(FadeIn(result_boxes[i], shift=UP * 0.2), run_time=0.3)
+            for i in range(N_demo)
+        ]))
 
         self.wait(2)
 
@@ -193,16 +225,17 @@ class TwoComplement(Scene):
         flip_explanation.shift(DOWN * 2.2)
         self.play(Write(flip_explanation))
 
-        # Visual emphasis: flash between original and inverted
+        # Visual emphasis: flash between original and inverted. Colouring the
+        # whole row recolours every bit, one animation per row instead of per bit
         for _ in range(2):
             self.play(
-                *[x_boxes[i].animate.set_color(RED) for i in range(N_demo)],
-                *[result_boxes[i].animate.set_color(GREEN) for i in range(N_demo)],
+                x_boxes.animate.set_color(RED),
+                result_boxes.animate.set_color(GREEN),
                 run_time=0.5
             )
             self.play(
-                *[x_boxes[i].animate.set_color(WHITE) for i in range(N_demo)],
-                *[result_boxes[i].animate.set_color(WHITE) for i in range(N_demo)],
+                x_boxes.animate.set_color(WHITE),
+                result_boxes.animate.set_color(WHITE),
                 run_time=0.5
             )
 
@@ -210,11 +243,11 @@ class TwoComplement(Scene):
 
         # Clear bit demonstration
         self.play(
-            *[FadeOut(mob) for mob in [
+            FadeOut(VGroup(
                 bit_demo_title, all_ones_label, all_ones_boxes, minus_sign,
                 x_label, x_boxes, equals_line, result_label, result_boxes,
                 flip_explanation
-            ]],
+            )),
             run_time=1
         )
 
@@ -242,7 +275,7 @@ class TwoComplement(Scene):
 
         # Clear for algorithm demo
         self.play(
-            *[FadeOut(mob) for mob in [step3, arrow_final, result, box, title1]],
+            FadeOut(VGroup(step3, arrow_final, result, box, title1)),
             run_time=1
         )
 
@@ -278,21 +311,24 @@ class TwoComplement(Scene):
         step_label1.shift(UP * 0.5)
         self.play(Write(step_label1))
 
-        # Create inverted bits
-        inverted_string = ''.join('1' if b == '0' else '0' for b in bit_string)
+        # Create inverted bits, the whole two's complement is worked out once here
+        inverted_val, result_val, carry_bits = twos_complement(x, N)
+        inverted_string = bits_to_string(inverted_val, N)
         inverted_boxes = bit_boxes(inverted_string, bit_size=0.6)
         inverted_boxes.shift(DOWN * 0.3)
 
         inverted_label = MathTex(rf"\sim x = {inverted_string}_2")
         inverted_label.next_to(inverted_boxes, RIGHT, buff=0.5)
 
-        for i, (orig_box, inv_box) in enumerate(zip(boxes, inverted_boxes)):
-            self.play(
+        self.play(Succession(*[
+            AnimationGroup(
                 Indicate(orig_box[0], color=YELLOW, scale_factor=1.3),
                 Flash(inv_box.get_center(), color=BLUE, flash_radius=0.3),
                 FadeIn(inv_box),
                 run_time=0.25
             )
+            for orig_box, inv_box in zip(boxes, inverted_boxes)
+        ]))
 
         self.play(Write(inverted_label))
 
@@ -304,9 +340,6 @@ class TwoComplement(Scene):
         step_label2.shift(DOWN * 1.4)
         self.play(Write(step_label2))
 
-        # Calculate result
-        inverted_val = int(inverted_string, 2)
-        result_val = (inverted_val + 1) & ((1 << N) - 1)
         result_string = bits_to_string(result_val, N)
 
         result_boxes = bit_boxes(result_string, bit_size=0.6)
@@ -316,7 +349,6 @@ class TwoComplement(Scene):
         result_label.next_to(result_boxes, RIGHT, buff=0.5)
 
         # Animate the addition with carry propagation
-        carry = inverted_val & 1
         temp_boxes = inverted_boxes.copy()
         self.add(temp_boxes)
 
@@ -325,40 +357,39 @@ class TwoComplement(Scene):
         plus_one.next_to(inverted_boxes[-1], DOWN, buff=0.2)
         self.play(Write(plus_one))
 
-        max_bit = 0
-
-        for i in range(N - 1, -1, -1):
-            if carry == 0:
-                break
-
-            max_bit += 1
+        # The whole carry chain is collected and played as one Succession
+        carry_steps = []
+        carry_indicator = Text("↑", color=RED, font_size=36)
 
+        # Bits the carry visits, from the LSB up
+        for i in range(N - 1, N - 1 - carry_bits, -1):
             # Highlight current bit with carry
-            carry_indicator = Text("↑", color=RED, font_size=36)
-            carry_indicator.next_to(temp_boxes[i], DOWN, buff=0.1)
-            self.play(FadeIn(carry_indicator, shift=UP * 0.2), run_time=0.3)
-
-            old_bit = int(inverted_string[i])
-            new_bit = (old_bit + carry) % 2
-            carry = (old_bit + carry) // 2
-
-            # Show bit flip
-            self.play(
-                temp_boxes[i][1].animate.set_color(RED),
-                Flash(temp_boxes[i].get_center(), color=RED),
-                run_time=0.3
-            )
-            self.play(
-                Transform(temp_boxes[i][1], result_boxes[i][1].copy()),
-                FadeIn(result_boxes[i]),
-                run_time=0.3
-            )
-            self.play(FadeOut(carry_indicator), run_time=0.2)
-
-        # Make remaining bits visible
-        for i in range(N - max_bit):
-            if result_boxes[i].get_fill_opacity() < 1:
-                self.play(FadeIn(result_boxes[i]), run_time=0.1)
+            indicator = carry_indicator.copy()
+            indicator.next_to(temp_boxes[i], DOWN, buff=0.1)
+
+            carry_steps += [
+                FadeIn(indicator, shift=UP * 0.2, run_time=0.3),
+                # Show bit flip
+                AnimationGroup(
+                    temp_boxes[i][1].animate.set_color(RED),
+                    Flash(temp_boxes[i].get_center(), color=RED),
+                    run_time=0.3
+                ),
+                AnimationGroup(
+                    Transform(temp_boxes[i][1], result_boxes[i][1].copy()),
+                    FadeIn(result_boxes[i]),
+                    run_time=0.3
+                ),
+                FadeOut(indicator, run_time=0.2),
+            ]
+
+        # Make remaining bits visible, all together in one short step
+        remaining = [result_boxes[i] for i in range(N - carry_bits) if result_boxes[i].get_fill_opacity() < 1]
+        if remaining:
+            carry_steps.append(AnimationGroup(*[FadeIn(b) for b in remaining], run_time=0.1))
+
+        if carry_steps:
+            self.play(Succession(*carry_steps))
 
         self.play(FadeOut(plus_one), FadeOut(temp_boxes))
         self.play(Write(result_label))
@@ -375,10 +406,10 @@ class TwoComplement(Scene):
 
         # Clear everything for summary
         self.play(
-            *[FadeOut(mob) for mob in [
+            FadeOut(VGroup(
                 algo_title, orig_label, boxes, orig_bits, inverted_boxes,
                 inverted_label, result_boxes, result_label, step_label2, verify
-            ]],
+            )),
             run_time=1
         )
 
@@ -426,5 +457,11 @@ if __name__ == '__main__':
     config.pixel_width = 1920
     config.frame_rate = 30
 
+    # Reuse the partial movie file of every unchanged play() across re-renders,
+    # the scene's play() and wait() calls come close to the default limit of 100
+    config.disable_caching = False
+    config.flush_cache = False
+    config.max_files_cached = 1000
+
     scene = TwoComplement()
     scene.render()
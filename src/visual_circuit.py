@@ -1,4 +1,4 @@
-from functools import partial
+from functools import lru_cache, partial
 from typing import Sequence, Self, Callable
 
 from manim import *
@@ -16,10 +16,14 @@ class CircuitShape(VGroup):
         if hasattr(self, "fill_shape"):
             self.fill_shape: VGroup
 
-            shape = self.fill_shape.animate if ANIMATE else self.fill_shape
+            fill = dict(color=target_color, opacity=0.8 if is_active else 0.2)
 
-            return stroke, shape.set_fill(color=target_color, opacity=0.8 if is_active else 0.2), shape.set_stroke(
-                color=target_color)
+            if ANIMATE:
+                # Fill and stroke chained on a single builder, returned once
+                return stroke, self.fill_shape.animate.set_fill(**fill).set_stroke(color=target_color)
+
+            # The stroke is already set, fill_shape is part of this group
+            return stroke, self.fill_shape.set_fill(**fill)
 
 
 class VisualGroup(CircuitShape):
@@ -41,8 +45,18 @@ class VisualGroup(CircuitShape):
         return animations
 
 
-def center_return(com: VectorizedPoint):
-    return com.get_location()
+class PointSet(VMobject):
+    """
+    Invisible carrier for a fixed set of points. Like a VectorizedPoint per
+    point it follows every transform of its parent, but as a single Mobject.
+    """
+
+    def __init__(self, locations, **kwargs):
+        super().__init__(fill_opacity=0, stroke_width=0, **kwargs)
+        self.set_points(np.array(locations, dtype=float).reshape(-1, 3))
+
+    def get_point(self, i) -> np.ndarray:
+        return np.array(self.points[i])
 
 
 class LocalCoordinate(VGroup):
@@ -54,54 +68,131 @@ class LocalCoordinate(VGroup):
     def __init__(self, component, debug=False, **kwargs):
         super().__init__(**kwargs)
 
+        names = []
+        locations = []
+
         for fun in (component.get_right,
                     component.get_left,
                     component.get_top,
                     component.get_bottom,
                     component.get_center):
-            variable_name = f"p_{fun.__name__}"
-
-            comp = VectorizedPoint(location=fun())
-            setattr(self, variable_name, comp)
-
-            self.add(comp)
-
-            setattr(self, fun.__name__, partial(center_return, comp))
+            names.append(fun.__name__)
+            locations.append(fun())
 
         # Corner points
         for tb in ['top', 'bottom']:
             for rl in ['right', 'left']:
-                name = f"{tb}_{rl}"
-
-                tb_v = getattr(self, f"get_{tb}")()
-                rl_v = getattr(self, f"get_{rl}")()
+                tb_v = locations[names.index(f"get_{tb}")]
+                rl_v = locations[names.index(f"get_{rl}")]
 
-                loc = same_x(rl_v, tb_v)
+                names.append(f"get_{tb}_{rl}")
+                locations.append(same_x(rl_v, tb_v))
 
-                comp = VectorizedPoint(location=loc)
-                setattr(self, f"p_{name}", comp)
+        # All nine reference points share one submobject instead of one each
+        self.points_set = PointSet(locations)
+        self.add(self.points_set)
 
-                self.add(comp)
+        for i, name in enumerate(names):
+            setattr(self, name, partial(self.points_set.get_point, i))
 
-                setattr(self, f"get_{name}", partial(center_return, comp))
-
-        if debug:
+        # Markers for checking the layout, stripped entirely under python -O
+        if __debug__ and debug:
             r = 0.1
-            for comp in self.submobjects[:]:
-                self.add(Circle(radius=r).move_to(comp.get_location()))
+            for loc in locations:
+                self.add(Circle(radius=r).move_to(loc))
+
 
+class Pins(PointSet):
+    """Pin locations as the rows of one PointSet, not a VectorizedPoint each."""
 
-class Pins(VGroup):
     def __init__(self, *locations, **kwargs):
-        super().__init__(**kwargs)
+        super().__init__(locations, **kwargs)
 
-        for v in locations:
-            point = VectorizedPoint(location=v)
+    def __getitem__(self, item):
+        return self.get_point(item)
 
-            self.add(point)
 
-    def __getitem__(self, item):
-        return self.submobjects[item].get_location()
+@lru_cache(maxsize=None)
+def _gate_body(gate_type: str) -> VMobject:
+    """
+    Prototype fill shape of each gate type, every VisualGate works on a copy.
+    The shapes never change, so the NOT gate's path union and the arc
+    tessellation run once per gate type instead of once per gate.
+    """
+    if gate_type == "OR":
+        return ArcPolygon(
+            [-1, 0.5, 0], [-1, -0.5, 0], [1, 0, 0],
+            arc_config=[{"angle": -1.5}, {"angle": PI / 4}, {"angle": PI / 4}]
+        )
+
+    if gate_type == "AND":
+        # The D outline of the square / circle union, traced directly instead
+        # of through a path union: the right half circle, then the flat side
+        body = VMobject().set_points(Arc(start_angle=-PI / 2, angle=PI, radius=0.5).points)
+
+        # Edges drawn on top of the outline, as before
+        return VGroup(body.add_points_as_corners([[-1, 0.5, 0], [-1, -0.5, 0], [0, -0.5, 0]]),
+                      Arc(start_angle=-PI / 2, angle=PI, radius=0.5).shift(RIGHT * 0, UP * 0),
+                      Line([-1, 0.5, 0], [0, 0.5, 0]))
+
+    if gate_type == "NOT":
+        t = Triangle().scale(0.5).rotate(-90 * DEGREES)
+        union = Union(t, Circle(radius=0.15).next_to(t.get_right()).shift(LEFT * 0.2, UP * 0))
+
+        return VGroup(VMobject().set_points(union.points))
+
+    if gate_type == "LED":
+        # Diode triangle
+        diode = Triangle(color=WHITE)
+        diode.scale(0.5)
+        diode.rotate(-90 * DEGREES)
+
+        # Cathode bar
+        cathode = Line(
+            start=diode.get_top(),
+            end=diode.get_bottom()
+        ).next_to(diode.get_right(), buff=0.05)
+
+        # Light emission arrows
+        angle = 45
+        radius = 0.75
+        params = {
+            "buff": 0,
+            "stroke_width": 4,
+            "max_tip_length_to_length_ratio": 0.25
+        }
+        arrow = np.array([np.cos(angle), np.sin(angle), 0]) * radius
+
+        start = diode.get_top() + DOWN * 0.1
+
+        arrow_1 = Arrow(
+            start=start,
+            end=start + arrow,
+            **params
+        )
+
+        start = diode.get_top() + RIGHT * 0.2 + DOWN * 0.2
+
+        arrow_2 = Arrow(
+            start=start,
+            end=start + arrow,
+            **params
+        )
+
+        # The (diode, cathode) group is the gate's center shape
+        return VGroup(
+            VGroup(diode, cathode),
+            arrow_1,
+            arrow_2,
+        )
+
+    raise ValueError("Unknown gate_type")
+
+
+@lru_cache(maxsize=None)
+def _block_rect(width: float, height: float) -> Rectangle:
+    """Prototype VisualBlock outline per size, blocks work on a copy."""
+    return Rectangle(width=width, height=height, color=WHITE, fill_color=GREY)
 
 
 class VisualGate(CircuitShape):
@@ -109,94 +200,12 @@ class VisualGate(CircuitShape):
 
     def __init__(self, gate_type, **kwargs):
         super().__init__(**kwargs)
-        self.fill_shape = VGroup()
-        self.num_inputs = 2
+        self.fill_shape = _gate_body(gate_type).copy()
+        self.num_inputs = 1 if gate_type in ("NOT", "LED") else 2
         self.num_outputs = 1
 
-        self.center_shape = None
-
         # TODO should probably just make VisualGate be an abstract class or something
-        if gate_type == "OR":
-            self.fill_shape = ArcPolygon(
-                [-1, 0.5, 0], [-1, -0.5, 0], [1, 0, 0],
-                arc_config=[{"angle": -1.5}, {"angle": PI / 4}, {"angle": PI / 4}]
-            )
-        elif gate_type == "AND":
-            self.fill_shape = Union(
-                Rectangle(height=1.0, width=1.0).shift(LEFT * 0.5),
-                Circle(radius=0.5).shift(RIGHT * 0, UP * 0)
-            )
-
-            # Cleanup union artifacts
-            self.fill_shape = VGroup(self.fill_shape.add_points_as_corners([[-1, 0.5, 0], [-1, -0.5, 0], [0, -0.5, 0]]),
-                                     Arc(start_angle=-PI / 2, angle=PI, radius=0.5).shift(RIGHT * 0, UP * 0),
-                                     Line([-1, 0.5, 0], [0, 0.5, 0]))
-        elif gate_type == "NOT":
-            # OR
-            t = Triangle().scale(0.5).rotate(-90 * DEGREES)
-
-            self.fill_shape = VGroup(
-                Union(t,
-                      Circle(radius=0.15).next_to(t.get_right()).shift(LEFT * 0.2, UP * 0),
-                      ))
-
-            self.num_inputs = 1
-
-        elif gate_type == "LED":
-            self.num_inputs = 1
-
-            # Diode triangle
-            diode = Triangle(color=WHITE)
-            diode.scale(0.5)
-            diode.rotate(-90 * DEGREES)
-
-            # Cathode bar
-            cathode = Line(
-                start=diode.get_top(),
-                end=diode.get_bottom()
-            ).next_to(diode.get_right(), buff=0.05)
-
-            # Light emission arrows
-            angle = 45
-            radius = 0.75
-            params = {
-                "buff": 0,
-                "stroke_width": 4,
-                "max_tip_length_to_length_ratio": 0.25
-            }
-            arrow = np.array([np.cos(angle), np.sin(angle), 0]) * radius
-
-            start = diode.get_top() + DOWN * 0.1
-
-            arrow_1 = Arrow(
-                start=start,
-                end=start + arrow,
-                **params
-            )
-
-            start = diode.get_top() + RIGHT * 0.2 + DOWN * 0.2
-
-            arrow_2 = Arrow(
-                start=start,
-                end=start + arrow,
-                **params
-            )
-
-            shape = VGroup(diode, cathode)
-
-            self.fill_shape = VGroup(
-                shape,
-                arrow_1,
-                arrow_2,
-            )
-
-            self.center_shape = shape
-
-        else:
-            raise ValueError("Unknown gate_type")
-
-        if self.center_shape is None:
-            self.center_shape = self.fill_shape
+        self.center_shape = self.fill_shape[0] if gate_type == "LED" else self.fill_shape
 
         self.local_transform = LocalCoordinate(self.center_shape)
 
@@ -208,8 +217,8 @@ class VisualGate(CircuitShape):
         self.actual = False
         self.prev_actual = self.actual
 
-        self.input_pins = Pins(self.compute_entry_points(is_input=True))
-        self.output_pins = Pins(self.compute_entry_points(is_input=False))
+        self.input_pins = Pins(*self.compute_entry_points(is_input=True))
+        self.output_pins = Pins(*self.compute_entry_points(is_input=False))
 
         self.pins = VGroup(self.input_pins, self.output_pins)
 
@@ -231,18 +240,13 @@ class VisualGate(CircuitShape):
             bottom = self.local_transform.get_bottom_right()
             num_vals = self.num_outputs
 
+        # Always (num_vals, 3), a single pin sits in the middle of the edge
         if num_vals == 1:
-            return (top + bottom) / 2
-
-        range_ = top - bottom
+            return ((top + bottom) / 2)[None]
 
-        margined_range = range_ * VisualGate.margin
+        res = (top - bottom) * VisualGate.margin / 2
 
-        res = margined_range / 2
-
-        width = np.linspace(top - res, bottom + res, num=self.num_inputs)
-
-        return width
+        return np.linspace(top - res, bottom + res, num=num_vals)
 
     def get_out(self, n=0):
         return self.output_pins[n]
@@ -270,7 +274,7 @@ class VisualBlock(CircuitShape):
     def __init__(self, label, sub_label: int = 0, width=2.5, height=1.0, **kwargs):
         super().__init__(**kwargs)
 
-        self.rect = Rectangle(width=width, height=height, color=WHITE, fill_color=GREY)
+        self.rect = _block_rect(width, height).copy()
         self.fill_shape = self.rect
 
         self.text = Text(label, font_size=20).move_to(self.rect.get_center() + UP * 0.2)
@@ -279,16 +283,27 @@ class VisualBlock(CircuitShape):
         self.val_text = Integer(sub_label, font_size=32, color=BLUE)
         self.val_text.move_to(self.rect.get_center() + DOWN * 0.2)
 
-        if ANIMATE:
-            self.val_text.add_updater(lambda m: m.set_value(self.current_val))
+        # Value the text was last built for, the updater only rebuilds on change
+        self._last_rendered_val = sub_label
+        # Attached by the first update_val(), static blocks never run it
+        self._has_updater = False
 
         self.add(self.rect, self.text, self.val_text)
         self.set_active(False)
 
+    def _update_val_text(self, m):
+        v = self.current_val
+        if v != self._last_rendered_val:
+            m.set_value(v)
+            self._last_rendered_val = v
+
     def update_val(self, val):
         self.current_val = val
         if not ANIMATE:
             self.val_text.set_value(val)
+        elif not self._has_updater:
+            self.val_text.add_updater(self._update_val_text)
+            self._has_updater = True
         return None
 
 
@@ -304,7 +319,8 @@ class VisualWire(CircuitShape):
     def set_active(self, is_active):
         shape = self.line.animate if ANIMATE else self.line
 
-        return shape.set_color(YELLOW if is_active else GREY).set_stroke(width=6 if is_active else 2)
+        # A wire has no fill, so a single set_stroke covers colour and width
+        return shape.set_stroke(color=YELLOW if is_active else GREY, width=6 if is_active else 2)
 
 
 class VisualResistor(VisualWire):
@@ -576,14 +592,16 @@ class VisualNMOS(CircuitShape):
 
 
 def same_y(target, val):
-    val = val[:]
+    """val with the y of target, as a new array. Neither argument is written to."""
+    val = np.array(val, dtype=float)
     val[1] = target[1]
 
     return val
 
 
 def same_x(target, val):
-    val = val[:]
+    """val with the x of target, as a new array. Neither argument is written to."""
+    val = np.array(val, dtype=float)
     val[0] = target[0]
 
     return val
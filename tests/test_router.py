@@ -0,0 +1,79 @@
+import contextlib
+import io
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import matplotlib
+import numpy as np
+
+matplotlib.use("Agg")
+
+from router import Component, Router  # noqa: E402
+
+
+def _route_single_net(pins):
+    router = Router(80, 50)
+    # Its margin touches the bottom edge, so (62, 0) escapes to (62, -1)
+    router.add_component(Component("C0", 60, 2, 6, 7))
+    router.add_net(pins)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        router.route()
+
+    return router.routed_paths[0]
+
+
+class EdgeMarginEscapeTest(unittest.TestCase):
+    def assert_connected(self, path, pins):
+        for pin in pins:
+            self.assertIn(pin, path)
+        # Both pins sit in the lower half, a cell near the top edge means the
+        # off grid escape point wrapped around
+        self.assertLess(max(p.y for p in path), 40)
+
+    def test_edge_pin_as_source(self):
+        path = _route_single_net([(62, 0), (22, 33)])
+        self.assert_connected(path, [(62, 0), (22, 33)])
+        # The wire docks back into the pin, not at the far edge
+        self.assertEqual(path[-1], (62, 0))
+
+    def test_edge_pin_as_target(self):
+        path = _route_single_net([(22, 33), (62, 0)])
+        self.assert_connected(path, [(62, 0), (22, 33)])
+        # The search leaves the off grid escape point onto the cell next to it
+        i = path.index((62, -1), 2)
+        self.assertEqual(path[i + 1], (62, 0))
+
+
+class ParallelRouteTest(unittest.TestCase):
+    def test_keeps_best_iteration(self):
+        router = Router(50, 50)
+        for comp in [Component("CPU", 10, 10, 8, 8), Component("MEM", 30, 10, 8, 8),
+                     Component("IO", 20, 30, 6, 6), Component("PWR", 5, 35, 5, 5)]:
+            router.add_component(comp)
+        router.add_net([(18, 14), (30, 14)])
+        router.add_net([(14, 18), (23, 30), (7, 35)])
+        router.add_net([(14, 10), (10, 11), (40, 5), (10, 40)])
+        router.add_net([(5, 39), (40, 10)])
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            router.route(workers=2)
+
+        per_iteration = [int(n) for n in re.findall(r"Iteration \d+: Overlaps: (\d+)", log.getvalue())]
+        self.assertEqual(np.count_nonzero(router.wire_count > 1), min(per_iteration))
+
+        # The restored occupancy matches the restored paths
+        coords = np.concatenate(list(router.routed_coords.values()))
+        coords = coords[(coords >= 0).all(axis=1) & (coords < 50).all(axis=1)]
+        expected = np.zeros_like(router.wire_count)
+        np.add.at(expected, (coords[:, 0], coords[:, 1]), 1)
+        np.testing.assert_array_equal(router.wire_count, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()